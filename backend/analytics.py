@@ -0,0 +1,180 @@
+"""Cohort, area and task analytics over the users x tasks completion matrix.
+
+server.py loads participants and completions column by column, takes the
+active tasks from its catalog cache, and calls build_report in a worker
+thread. Every statistic here is computed with NumPy/pandas array operations
+over the whole matrix, not per user. The module does not import the app.
+"""
+from datetime import datetime
+from typing import Any, Dict, List
+
+import numpy as np
+import pandas as pd
+
+LOAD_BATCH_SIZE = 5000  # Documents pulled per cursor batch while loading columns
+
+async def load_columns(cursor, fields: List[str]) -> pd.DataFrame:
+    """Drain a Motor cursor into a DataFrame, appending field values to column lists batch by batch"""
+    columns: Dict[str, list] = {field: [] for field in fields}
+    cursor.batch_size(LOAD_BATCH_SIZE)
+    while True:
+        batch = await cursor.to_list(LOAD_BATCH_SIZE)
+        if not batch:
+            break
+        for field in fields:
+            columns[field].extend(doc.get(field) for doc in batch)
+    return pd.DataFrame(columns)
+
+async def load_frames(db, task_ids: List[str]) -> Dict[str, pd.DataFrame]:
+    users = await load_columns(
+        db.users.find({"is_admin": {"$ne": True}}, {"_id": 0, "id": 1, "created_at": 1}),
+        ["id", "created_at"]
+    )
+    completions = await load_columns(
+        db.task_completions.find({"task_id": {"$in": task_ids}}, {"_id": 0, "user_id": 1, "task_id": 1}),
+        ["user_id", "task_id"]
+    )
+    return {"users": users, "completions": completions}
+
+def completion_matrix(users: pd.DataFrame, tasks: pd.DataFrame, completions: pd.DataFrame) -> np.ndarray:
+    """Boolean matrix: row i is users.id[i], column j is tasks.id[j]"""
+    matrix = np.zeros((len(users), len(tasks)), dtype=bool)
+    if completions.empty:
+        return matrix
+    rows = pd.Categorical(completions["user_id"], categories=users["id"]).codes
+    cols = pd.Categorical(completions["task_id"], categories=tasks["id"]).codes
+    known = (rows >= 0) & (cols >= 0)
+    matrix[rows[known], cols[known]] = True
+    return matrix
+
+def slice_progress(matrix: np.ndarray, tasks: pd.DataFrame, framework: Dict[str, Any]) -> pd.DataFrame:
+    """Percent complete per user (rows) and framework sub-competency (columns, MultiIndex area/sub).
+
+    Sub-competencies without active tasks score 0, as in the stored progress.
+    """
+    slices = [
+        (area_key, sub_key)
+        for area_key, area_data in framework.items()
+        for sub_key in area_data["sub_competencies"]
+    ]
+    slice_codes = pd.Categorical(
+        list(zip(tasks["competency_area"], tasks["sub_competency"])), categories=slices
+    ).codes if len(tasks) else np.array([], dtype=np.int8)
+
+    # tasks x slices one-hot membership; matrix @ membership counts completions per slice
+    membership = np.zeros((len(tasks), len(slices)))
+    in_framework = slice_codes >= 0
+    membership[np.flatnonzero(in_framework), slice_codes[in_framework]] = 1.0
+    totals = membership.sum(axis=0)
+
+    completed = matrix.astype(np.float64) @ membership
+    percentages = np.divide(completed * 100, totals, out=np.zeros_like(completed), where=totals > 0)
+    return pd.DataFrame(percentages, columns=pd.MultiIndex.from_tuples(slices, names=["area", "sub"]))
+
+def distribution(values: np.ndarray) -> Dict[str, float]:
+    if values.size == 0:
+        return {"mean": 0.0, "median": 0.0, "p25": 0.0, "p75": 0.0}
+    p25, median, p75 = np.percentile(values, [25, 50, 75])
+    return {
+        "mean": round(float(values.mean()), 1),
+        "median": round(float(median), 1),
+        "p25": round(float(p25), 1),
+        "p75": round(float(p75), 1),
+    }
+
+def area_statistics(area_progress: pd.DataFrame, progress: pd.DataFrame, framework: Dict[str, Any]) -> Dict[str, Any]:
+    areas = {}
+    for area_key, area_data in framework.items():
+        values = area_progress[area_key].to_numpy()
+        subs = progress[area_key]
+        areas[area_key] = {
+            "name": area_data["name"],
+            "progress": distribution(values),
+            "users_complete": int((values >= 100).sum()),
+            "users_not_started": int((values == 0).sum()),
+            "sub_competencies": {
+                sub_key: {
+                    "name": area_data["sub_competencies"][sub_key],
+                    "mean_progress": round(float(subs[sub_key].mean()), 1) if len(subs) else 0.0,
+                }
+                for sub_key in subs.columns
+            },
+        }
+    return areas
+
+def cohort_statistics(users: pd.DataFrame, area_progress: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Average progress per area for each join-month cohort (users.created_at)"""
+    if users.empty:
+        return []
+    joined = pd.to_datetime(users["created_at"], errors="coerce")
+    frame = area_progress.copy()
+    frame["overall"] = area_progress.mean(axis=1)
+    frame["cohort"] = joined.dt.strftime("%Y-%m").fillna("unknown").to_numpy()
+    grouped = frame.groupby("cohort", sort=True)
+    means = grouped.mean().round(1)
+    sizes = grouped.size()
+    return [
+        {
+            "cohort": cohort,
+            "users": int(sizes[cohort]),
+            "overall_progress": float(row["overall"]),
+            "areas": {area_key: float(row[area_key]) for area_key in area_progress.columns},
+        }
+        for cohort, row in means.iterrows()
+    ]
+
+def task_statistics(matrix: np.ndarray, tasks: pd.DataFrame) -> List[Dict[str, Any]]:
+    """Completion counts and blockers per task.
+
+    A user is blocked on a task when it is the lowest-order task they have not
+    completed in a sub-competency they have started but not finished.
+    """
+    user_count = matrix.shape[0]
+    completions = matrix.sum(axis=0)
+    blocked = np.zeros(len(tasks), dtype=np.int64)
+
+    for _, positions in tasks.groupby(["competency_area", "sub_competency"], sort=False).indices.items():
+        positions = positions[np.argsort(tasks["order"].to_numpy()[positions], kind="stable")]
+        done = matrix[:, positions]
+        completed_here = done.sum(axis=1)
+        started = (completed_here > 0) & (completed_here < len(positions))
+        if not started.any():
+            continue
+        first_open = np.argmax(~done[started], axis=1)
+        blocked[positions] += np.bincount(first_open, minlength=len(positions))
+
+    rates = completions / user_count * 100 if user_count else np.zeros(len(tasks))
+    return [
+        {
+            "task_id": task_id,
+            "title": title,
+            "competency_area": area,
+            "sub_competency": sub,
+            "completions": int(count),
+            "completion_rate": round(float(rate), 1),
+            "blocked_users": int(blocked_count),
+        }
+        for task_id, title, area, sub, count, rate, blocked_count in zip(
+            tasks["id"], tasks["title"], tasks["competency_area"], tasks["sub_competency"],
+            completions, rates, blocked
+        )
+    ]
+
+def build_report(users: pd.DataFrame, tasks: pd.DataFrame, completions: pd.DataFrame, framework: Dict[str, Any]) -> Dict[str, Any]:
+    """All analytics views from one completion matrix (CPU-bound; run off the event loop)"""
+    matrix = completion_matrix(users, tasks, completions)
+    progress = slice_progress(matrix, tasks, framework)
+    # Area progress is the mean of its sub-competencies, as on the competency page
+    area_progress = progress.T.groupby(level="area", sort=False).mean().T
+    if area_progress.empty:
+        area_progress = pd.DataFrame(0.0, index=range(len(users)), columns=list(framework))
+
+    return {
+        "generated_at": datetime.utcnow(),
+        "users": len(users),
+        "tasks": len(tasks),
+        "completions": int(matrix.sum()),
+        "areas": area_statistics(area_progress, progress, framework),
+        "cohorts": cohort_statistics(users, area_progress),
+        "task_stats": task_statistics(matrix, tasks),
+    }
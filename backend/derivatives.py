@@ -0,0 +1,62 @@
+"""Image derivatives (thumbnails and previews) for portfolio files.
+
+Rendering is CPU-bound, so server.py runs render_derivatives in a process
+pool. This module is kept free of app and database imports so worker
+processes start quickly.
+"""
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from PIL import Image, ImageOps
+
+# Fixed-size variants: longest side in pixels, output format and quality
+DERIVATIVE_VARIANTS = {
+    "thumb": {"max_side": 200, "format": "WEBP", "extension": "webp", "media_type": "image/webp", "quality": 80},
+    "card": {"max_side": 480, "format": "WEBP", "extension": "webp", "media_type": "image/webp", "quality": 82},
+    "preview": {"max_side": 1280, "format": "JPEG", "extension": "jpg", "media_type": "image/jpeg", "quality": 85},
+}
+
+IMAGE_MIME_TYPES = {'image/jpeg', 'image/jpg', 'image/png', 'image/gif', 'image/bmp'}
+
+def derivative_path(original_path: str, variant: str) -> Path:
+    """Derivatives live next to the original: <original>.<variant>.<ext>"""
+    original = Path(original_path)
+    extension = DERIVATIVE_VARIANTS[variant]["extension"]
+    return original.with_name(f"{original.name}.{variant}.{extension}")
+
+def render_derivatives(original_path: str, variants: List[str]) -> Dict[str, str]:
+    """Render any missing variants of an image and return {variant: path}.
+
+    Each derivative is written to a temporary name and renamed into place, so
+    readers never see a partially written file.
+    """
+    rendered = {}
+    pending = [v for v in variants if not derivative_path(original_path, v).exists()]
+    for variant in variants:
+        if variant not in pending:
+            rendered[variant] = str(derivative_path(original_path, variant))
+    if not pending:
+        return rendered
+
+    with Image.open(original_path) as source:
+        source.seek(0)  # First frame of animated GIFs
+        image = ImageOps.exif_transpose(source)
+        image.load()
+
+    for variant in pending:
+        spec = DERIVATIVE_VARIANTS[variant]
+        output = image.copy()
+        output.thumbnail((spec["max_side"], spec["max_side"]), Image.LANCZOS)
+        if spec["format"] == "JPEG" and output.mode != "RGB":
+            output = output.convert("RGB")
+        elif output.mode not in ("RGB", "RGBA"):
+            output = output.convert("RGBA")
+
+        target = derivative_path(original_path, variant)
+        staging = target.with_name(f"{target.name}.{os.getpid()}.tmp")
+        output.save(staging, format=spec["format"], quality=spec["quality"])
+        os.replace(staging, target)
+        rendered[variant] = str(target)
+
+    return rendered
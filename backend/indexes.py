@@ -0,0 +1,140 @@
+"""MongoDB index registry for every query shape in server.py.
+
+server.py calls ensure_indexes at startup. To build indexes ahead of a deploy,
+or to list them, run:
+
+    python indexes.py          # create any missing indexes
+    python indexes.py --list   # print the registry without connecting
+
+create_indexes is a no-op for an index that already exists with the same
+options, so running this repeatedly is safe. If an index exists with the same
+keys but different options, it is reported as a conflict and left alone.
+
+index_query_plan_test.py (repo root) explains the hot queries against a local
+mongod and fails on any collection scan. Add a query there when you add an
+index here.
+"""
+import argparse
+import asyncio
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List
+
+from pymongo import ASCENDING, DESCENDING, IndexModel
+from pymongo.errors import OperationFailure
+
+INDEXES: Dict[str, List[IndexModel]] = {
+    "users": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("email", ASCENDING), ("is_admin", ASCENDING)]),  # Sign-up dedupe, admin login
+        IndexModel([("created_at", ASCENDING), ("id", ASCENDING)]),  # /users pages
+        IndexModel([("is_admin", ASCENDING), ("created_at", ASCENDING), ("id", ASCENDING)]),  # /admin/users pages, counts
+    ],
+    "tasks": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("created_at", DESCENDING), ("id", DESCENDING)]),  # /admin/tasks pages
+    ],
+    "task_completions": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("task_id", ASCENDING)], unique=True),  # One completion per task, per-user progress
+        IndexModel([("user_id", ASCENDING), ("completed_at", DESCENDING), ("id", DESCENDING)]),  # Completion pages
+        IndexModel([("task_id", ASCENDING), ("user_id", ASCENDING)]),  # Slice recompute by task
+        IndexModel([("evidence_file_path", ASCENDING)], sparse=True),  # Orphan scan
+    ],
+    "competency_progress": [
+        IndexModel([("user_id", ASCENDING), ("competency_area", ASCENDING), ("sub_competency", ASCENDING)]),
+        IndexModel([("competency_area", ASCENDING), ("sub_competency", ASCENDING), ("user_id", ASCENDING)]),  # Slice recompute
+    ],
+    "portfolio_items": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("user_id", ASCENDING), ("status", ASCENDING), ("upload_date", DESCENDING), ("id", DESCENDING)]),  # Portfolio pages
+        IndexModel([("file_path", ASCENDING)], sparse=True),  # Orphan scan
+    ],
+    "user_summaries": [
+        IndexModel([("user_id", ASCENDING)], unique=True),
+        IndexModel([("last_activity", DESCENDING)]),
+    ],
+    "completion_rollups": [
+        IndexModel([("granularity", ASCENDING), ("bucket", ASCENDING)], unique=True),
+    ],
+    "file_blobs": [
+        IndexModel([("sha256", ASCENDING)], unique=True),
+        IndexModel([("ref_count", ASCENDING)]),  # Ledger reconcile, unreferenced records in the orphan scan
+    ],
+    "storage_ledger": [
+        IndexModel([("key", ASCENDING)], unique=True),
+        IndexModel([("scope", ASCENDING)]),
+    ],
+    "file_deletion_queue": [
+        IndexModel([("enqueued_at", ASCENDING), ("attempts", ASCENDING)]),  # Oldest claimable entry first
+        IndexModel([("attempts", ASCENDING)]),  # GC status counts
+        IndexModel([("claimed_by", ASCENDING)], sparse=True),  # Batch claims
+    ],
+    "upload_sessions": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING), ("expires_at", ASCENDING)]),  # Expiry sweep
+        IndexModel([("content_hash", ASCENDING)], sparse=True),  # Direct uploads in flight, orphan scan
+    ],
+    "progress_recompute_jobs": [
+        IndexModel([("id", ASCENDING)], unique=True),
+        IndexModel([("status", ASCENDING), ("run_after", ASCENDING)]),  # Job claims
+        IndexModel([("requested_at", DESCENDING)]),
+    ],
+    "gc_reports": [
+        IndexModel([("id", ASCENDING)], unique=True),
+    ],
+    "catalog_versions": [
+        IndexModel([("id", ASCENDING)], unique=True),
+    ],
+}
+
+async def ensure_indexes(db) -> dict:
+    """Create every registered index that is missing.
+
+    Indexes are created one at a time, so a conflict on one index does not
+    stop the rest.
+    """
+    created, conflicts = [], []
+    for collection, models in INDEXES.items():
+        for model in models:
+            try:
+                names = await db[collection].create_indexes([model])
+                created.extend(f"{collection}.{name}" for name in names)
+            except OperationFailure as e:
+                name = model.document["name"]
+                logging.warning(f"Index {collection}.{name} not created: {e}")
+                conflicts.append({"index": f"{collection}.{name}", "error": str(e)})
+    return {"indexes": created, "conflicts": conflicts}
+
+def describe_indexes() -> List[str]:
+    return [
+        f"{collection}.{model.document['name']}" + (" (unique)" if model.document.get("unique") else "")
+        for collection, models in INDEXES.items()
+        for model in models
+    ]
+
+async def main(list_only: bool):
+    if list_only:
+        print("\n".join(describe_indexes()))
+        return
+
+    from dotenv import load_dotenv
+    from motor.motor_asyncio import AsyncIOMotorClient
+
+    load_dotenv(Path(__file__).parent / '.env')
+    client = AsyncIOMotorClient(os.environ['MONGO_URL'])
+    try:
+        report = await ensure_indexes(client[os.environ['DB_NAME']])
+    finally:
+        client.close()
+    print(f"✅ {len(report['indexes'])} indexes in place")
+    for conflict in report["conflicts"]:
+        print(f"❌ {conflict['index']}: {conflict['error']}")
+    if report["conflicts"]:
+        raise SystemExit(1)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Create the MongoDB indexes server.py relies on")
+    parser.add_argument("--list", action="store_true", help="print the registry without connecting")
+    asyncio.run(main(parser.parse_args().list))
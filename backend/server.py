@@ -1,20 +1,48 @@
-from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Form, Depends
+from fastapi import FastAPI, APIRouter, UploadFile, File, HTTPException, Form, Depends, Request, Response, Header
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from fastapi.responses import FileResponse
+from fastapi.responses import StreamingResponse, RedirectResponse, JSONResponse
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
+from starlette.requests import ClientDisconnect
 from motor.motor_asyncio import AsyncIOMotorClient
+from pymongo import ReturnDocument, UpdateOne, ReplaceOne
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 import os
+import asyncio
 import logging
+import threading
+import time
+import multiprocessing
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
+from email.utils import formatdate, parsedate_to_datetime
+from urllib.parse import quote
 from pathlib import Path
 from pydantic import BaseModel, Field
 from typing import List, Dict, Optional, Any
 import uuid
-from datetime import datetime, timedelta
+from datetime import datetime, timedelta, timezone
 import shutil
 import json
+import zipfile
+import mimetypes
+import hashlib
+import base64
+import gzip
+import re
+import boto3
+from botocore.config import Config as BotoConfig
+from botocore.exceptions import ClientError
 import jwt
+import orjson
+try:
+    import brotli
+except ImportError:  # Responses fall back to gzip
+    brotli = None
 from passlib.context import CryptContext
+from derivatives import DERIVATIVE_VARIANTS, IMAGE_MIME_TYPES, render_derivatives
+import pandas as pd
+from analytics import build_report, load_frames
+from indexes import ensure_indexes
 
 ROOT_DIR = Path(__file__).parent
 load_dotenv(ROOT_DIR / '.env')
@@ -42,6 +70,21 @@ def serialize_doc(doc):
     else:
         return doc
 
+def orjson_default(value):
+    if isinstance(value, ObjectId):
+        return str(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+class FastJSONResponse(JSONResponse):
+    """JSON rendered by orjson, which encodes datetimes natively.
+
+    List endpoints return this directly with documents fetched without _id, so
+    each document is encoded in a single pass instead of going through
+    serialize_doc and then FastAPI's jsonable_encoder.
+    """
+    def render(self, content: Any) -> bytes:
+        return orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+
 # Enhanced File Storage Configuration
 UPLOAD_DIR = Path("uploads")
 UPLOAD_DIR.mkdir(exist_ok=True)
@@ -50,13 +93,49 @@ UPLOAD_DIR.mkdir(exist_ok=True)
 PORTFOLIO_DIR = UPLOAD_DIR / "portfolio"
 EVIDENCE_DIR = UPLOAD_DIR / "evidence" 
 TEMP_DIR = UPLOAD_DIR / "temp"
+BLOB_DIR = UPLOAD_DIR / "blobs"  # Content-addressed store shared by portfolio and evidence files
+UPLOAD_SESSION_DIR = TEMP_DIR / "sessions"  # Staging area for resumable uploads
 
 # Create subdirectories
-for directory in [PORTFOLIO_DIR, EVIDENCE_DIR, TEMP_DIR]:
+for directory in [PORTFOLIO_DIR, EVIDENCE_DIR, TEMP_DIR, BLOB_DIR, UPLOAD_SESSION_DIR]:
     directory.mkdir(exist_ok=True)
 
 # File upload constraints
 MAX_FILE_SIZE = 50 * 1024 * 1024  # 50MB
+UPLOAD_CHUNK_SIZE = 1024 * 1024  # 1MB read size when streaming uploads to disk
+DOWNLOAD_CHUNK_SIZE = 256 * 1024  # Read size when streaming files to clients
+MAX_RANGES_PER_REQUEST = 16  # Larger multi-range requests are answered with the full file
+UPLOAD_SESSION_TTL = timedelta(hours=24)  # Resumable sessions expire after this much inactivity
+UPLOAD_SESSION_LOCK_TIMEOUT = timedelta(minutes=10)  # Max time a single PATCH may hold a session
+UPLOAD_COMMIT_TIMEOUT = timedelta(minutes=10)  # A session committing this long was abandoned by a crash
+BLOB_ACQUIRE_RETRIES = 50  # Attempts to reference a blob whose record is being deleted
+BLOB_ACQUIRE_RETRY_DELAY = 0.1  # Seconds between those attempts
+
+# Deferred garbage collection of deleted, abandoned and orphaned files
+GC_SWEEP_INTERVAL = 5 * 60  # Seconds between storage sweeps
+GC_BATCH_SIZE = 100  # Deletion queue entries fetched per round
+GC_MAX_ATTEMPTS = 5  # Queue entries failing this often are left for inspection
+GC_RETRY_DELAY = timedelta(minutes=5)  # Backoff after a failed deferred delete, doubled per attempt
+GC_CLAIM_TIMEOUT = timedelta(minutes=10)  # Claimed entries not yet removed are reclaimable after this
+GC_ITEM_DELAY = 0.05  # Seconds between sweeper file operations
+GC_MAX_FOREGROUND_QUEUE = 4  # Sweeper waits while the file I/O queue is deeper than this
+TEMP_FILE_MAX_AGE = timedelta(hours=24)  # Staging files untouched this long are removed
+ORPHAN_SCAN_INTERVAL = timedelta(hours=24)
+ORPHAN_GRACE_PERIOD = timedelta(hours=1)  # Younger files may belong to uploads in flight
+
+# File I/O executor: all blocking filesystem calls from request handlers run here
+FILE_IO_WORKERS = int(os.environ.get('FILE_IO_WORKERS', '8'))
+FILE_IO_MAX_PENDING = int(os.environ.get('FILE_IO_MAX_PENDING', '256'))  # Callers wait beyond this
+
+# Storage backend: "local" keeps blobs under UPLOAD_DIR, "s3" uses an S3-compatible bucket
+STORAGE_BACKEND = os.environ.get('STORAGE_BACKEND', 'local')
+S3_BUCKET = os.environ.get('S3_BUCKET')
+S3_ENDPOINT_URL = os.environ.get('S3_ENDPOINT_URL')  # e.g. http://localhost:9000 for MinIO
+S3_REGION = os.environ.get('S3_REGION', 'us-east-1')
+PRESIGNED_URL_EXPIRY = int(os.environ.get('PRESIGNED_URL_EXPIRY', '900'))  # Seconds
+
+# Image derivative rendering runs in its own process pool
+DERIVATIVE_WORKERS = int(os.environ.get('DERIVATIVE_WORKERS', '2'))
 ALLOWED_EXTENSIONS = {
     '.pdf', '.doc', '.docx', '.xls', '.xlsx', '.ppt', '.pptx',
     '.jpg', '.jpeg', '.png', '.gif', '.bmp',
@@ -90,20 +169,109 @@ SECRET_KEY = "your-secret-key-here-change-in-production"  # In production, use p
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
+# Async File I/O
+class FileIOMetrics:
+    """Queue depth and latency counters for the file I/O executor.
+
+    Updated from both the event loop and worker threads, hence the lock.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.pending = 0  # submitted and not finished
+        self.running = 0  # currently executing on a worker thread
+        self.peak_queue_depth = 0
+        self.operations: Dict[str, Dict[str, float]] = {}
+    
+    def submitted(self):
+        with self._lock:
+            self.pending += 1
+            self.peak_queue_depth = max(self.peak_queue_depth, self.pending - self.running)
+    
+    def started(self):
+        with self._lock:
+            self.running += 1
+    
+    def finished(self, operation: str, wait_seconds: float, io_seconds: float, failed: bool):
+        with self._lock:
+            self.pending -= 1
+            self.running -= 1
+            stats = self.operations.setdefault(operation, {
+                "count": 0, "errors": 0, "total_wait_ms": 0.0, "total_io_ms": 0.0, "max_io_ms": 0.0
+            })
+            stats["count"] += 1
+            stats["errors"] += int(failed)
+            stats["total_wait_ms"] += wait_seconds * 1000
+            stats["total_io_ms"] += io_seconds * 1000
+            stats["max_io_ms"] = max(stats["max_io_ms"], io_seconds * 1000)
+    
+    def queue_depth(self) -> int:
+        with self._lock:
+            return self.pending - self.running
+    
+    def snapshot(self) -> dict:
+        with self._lock:
+            operations = {}
+            for name, stats in self.operations.items():
+                count = stats["count"] or 1
+                operations[name] = {
+                    "count": stats["count"],
+                    "errors": stats["errors"],
+                    "avg_wait_ms": round(stats["total_wait_ms"] / count, 3),
+                    "avg_io_ms": round(stats["total_io_ms"] / count, 3),
+                    "max_io_ms": round(stats["max_io_ms"], 3)
+                }
+            return {
+                "workers": FILE_IO_WORKERS,
+                "max_pending": FILE_IO_MAX_PENDING,
+                "queue_depth": self.pending - self.running,
+                "in_flight": self.running,
+                "peak_queue_depth": self.peak_queue_depth,
+                "operations": operations
+            }
+
+file_io_executor = ThreadPoolExecutor(max_workers=FILE_IO_WORKERS, thread_name_prefix="file-io")
+file_io_slots = asyncio.Semaphore(FILE_IO_MAX_PENDING)
+file_io_metrics = FileIOMetrics()
+
+async def run_file_io(operation: str, func, *args):
+    """Run a blocking filesystem call on the file I/O executor and record its latency"""
+    async with file_io_slots:
+        submitted_at = time.perf_counter()
+        file_io_metrics.submitted()
+        
+        def timed_call():
+            started_at = time.perf_counter()
+            file_io_metrics.started()
+            failed = True
+            try:
+                result = func(*args)
+                failed = False
+                return result
+            finally:
+                file_io_metrics.finished(
+                    operation, started_at - submitted_at, time.perf_counter() - started_at, failed
+                )
+        
+        return await asyncio.get_running_loop().run_in_executor(file_io_executor, timed_call)
+
 # File Management Utilities
 def validate_file(file: UploadFile) -> tuple[bool, str]:
     """Validate uploaded file for security and size constraints"""
-    if not file.filename:
+    return validate_file_metadata(file.filename, file.content_type)
+
+def validate_file_metadata(filename: Optional[str], content_type: Optional[str]) -> tuple[bool, str]:
+    """Validate a file's name and MIME type before any bytes are accepted"""
+    if not filename:
         return False, "Filename is required"
     
     # Check file extension
-    file_extension = Path(file.filename).suffix.lower()
+    file_extension = Path(filename).suffix.lower()
     if file_extension not in ALLOWED_EXTENSIONS:
         return False, f"File type {file_extension} not allowed. Allowed types: {', '.join(ALLOWED_EXTENSIONS)}"
     
     # Check MIME type
-    if file.content_type and file.content_type not in ALLOWED_MIME_TYPES:
-        return False, f"MIME type {file.content_type} not allowed"
+    if content_type and content_type not in ALLOWED_MIME_TYPES:
+        return False, f"MIME type {content_type} not allowed"
     
     return True, "Valid file"
 
@@ -117,55 +285,56 @@ def generate_secure_filename(original_filename: str, file_id: str) -> str:
     # Create secure filename: UUID_sanitized_name.ext
     return f"{file_id}_{safe_name}{file_extension}" if safe_name else f"{file_id}{file_extension}"
 
-def get_file_storage_path(file_type: str, user_id: str, file_id: str) -> Path:
-    """Generate organized storage path based on file type and user"""
-    current_date = datetime.utcnow()
-    year_month = current_date.strftime("%Y-%m")
-    
-    if file_type == "portfolio":
-        base_dir = PORTFOLIO_DIR
-    elif file_type == "evidence":
-        base_dir = EVIDENCE_DIR
-    else:
-        base_dir = TEMP_DIR
-    
-    # Create path: uploads/portfolio/2024-01/user_id/
-    user_dir = base_dir / year_month / user_id
-    user_dir.mkdir(parents=True, exist_ok=True)
-    
-    return user_dir
-
 async def save_uploaded_file(file: UploadFile, file_type: str, user_id: str, file_id: str) -> dict:
-    """Save uploaded file with proper organization and security"""
+    """Save uploaded file with proper organization and security.
+
+    The upload is streamed in UPLOAD_CHUNK_SIZE pieces into a staging file while
+    it is hashed, so only one chunk is held in memory and it is rejected as soon
+    as it grows past MAX_FILE_SIZE. The staged file is then committed into the
+    content-addressed blob store, where identical uploads share one copy.
+    """
     # Validate file
     is_valid, message = validate_file(file)
     if not is_valid:
         raise HTTPException(status_code=400, detail=message)
     
-    # Check file size (read file to check size)
-    file_content = await file.read()
-    file_size = len(file_content)
-    
-    if file_size > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=400, 
-            detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
-        )
-    
-    # Generate secure filename and path
     secure_filename = generate_secure_filename(file.filename, file_id)
-    storage_path = get_file_storage_path(file_type, user_id, file_id)
-    file_path = storage_path / secure_filename
+    staging_path = TEMP_DIR / f"{file_id}.part"
     
-    # Save file
+    # Stream file to staging, enforcing the size limit on the running total
+    file_size = 0
+    hasher = hashlib.sha256()
     try:
-        with open(file_path, "wb") as buffer:
-            buffer.write(file_content)
+        buffer = await run_file_io("open", open, staging_path, "wb")
+        try:
+            while True:
+                chunk = await file.read(UPLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                file_size += len(chunk)
+                if file_size > MAX_FILE_SIZE:
+                    raise HTTPException(
+                        status_code=400, 
+                        detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
+                    )
+                hasher.update(chunk)
+                await run_file_io("write", buffer.write, chunk)
+        finally:
+            await run_file_io("close", buffer.close)
+        blob = await acquire_blob(staging_path, hasher.hexdigest(), file_size)
+        await record_storage_change(file_type, user_id, datetime.utcnow(), file_size, 1)
+    except HTTPException:
+        await delete_file(str(staging_path))
+        raise
     except Exception as e:
+        await delete_file(str(staging_path))
         raise HTTPException(status_code=500, detail=f"Failed to save file: {str(e)}")
+    finally:
+        await file.close()
     
     return {
-        "file_path": str(file_path),
+        "file_path": blob["path"],
+        "content_hash": blob["sha256"],
         "original_filename": file.filename,
         "secure_filename": secure_filename,
         "file_size": file_size,
@@ -173,8 +342,8 @@ async def save_uploaded_file(file: UploadFile, file_type: str, user_id: str, fil
         "file_type": file_type
     }
 
-def delete_file(file_path: str) -> bool:
-    """Safely delete a file"""
+def delete_file_sync(file_path: str) -> bool:
+    """Safely delete a file (blocking; use delete_file from async code)"""
     try:
         if file_path and Path(file_path).exists():
             Path(file_path).unlink()
@@ -182,6 +351,867 @@ def delete_file(file_path: str) -> bool:
     except Exception as e:
         logging.error(f"Failed to delete file {file_path}: {str(e)}")
     return False
+
+async def delete_file(file_path: str) -> bool:
+    """Safely delete a file on the file I/O executor"""
+    return await run_file_io("delete", delete_file_sync, file_path)
+
+# Storage backends
+# Stored files are addressed by a location string: a filesystem path for the
+# local backend or s3://bucket/key for S3, so records written under one backend
+# stay readable after switching the default.
+class LocalStorageBackend:
+    """Files under UPLOAD_DIR, accessed through the file I/O executor"""
+    name = "local"
+    supports_presigned_urls = False
+    
+    def location_for(self, key: str) -> str:
+        return str(UPLOAD_DIR / key)
+    
+    async def commit(self, staged_path: Path, location: str):
+        def place():
+            Path(location).parent.mkdir(parents=True, exist_ok=True)
+            os.replace(staged_path, location)
+        await run_file_io("commit", place)
+    
+    async def exists(self, location: str) -> bool:
+        return await run_file_io("stat", os.path.exists, location)
+    
+    async def stat(self, location: str) -> tuple[int, float]:
+        """(size, mtime); raises FileNotFoundError when missing"""
+        file_stat = await run_file_io("stat", os.stat, location)
+        return file_stat.st_size, file_stat.st_mtime
+    
+    async def delete(self, location: str) -> bool:
+        return await delete_file(location)
+    
+    async def download(self, location: str, local_path: Path):
+        await run_file_io("copy", shutil.copyfile, location, local_path)
+    
+    async def iter_stale(self, prefix: str, cutoff: float):
+        """Batches of locations under prefix last modified before cutoff, one per top-level shard"""
+        root = UPLOAD_DIR / prefix
+        shards = await run_file_io(
+            "scan", lambda: sorted(p for p in root.iterdir() if p.is_dir()) if root.exists() else []
+        )
+        for shard in shards:
+            yield await run_file_io("scan", list_files_older_than, shard, cutoff)
+    
+    async def iter_range(self, location: str, start: int, end: int):
+        async for chunk in iter_file_range(location, start, end):
+            yield chunk
+
+class S3StorageBackend:
+    """S3-compatible object storage (AWS S3, MinIO) via boto3 on the file I/O executor"""
+    name = "s3"
+    supports_presigned_urls = True
+    
+    def __init__(self, bucket: str, endpoint_url: Optional[str] = None, region: str = "us-east-1"):
+        self.bucket = bucket
+        self.client = boto3.client(
+            "s3",
+            endpoint_url=endpoint_url,
+            region_name=region,
+            config=BotoConfig(
+                signature_version="s3v4",
+                s3={"addressing_style": "path" if endpoint_url else "auto"}
+            )
+        )
+    
+    def location_for(self, key: str) -> str:
+        return f"s3://{self.bucket}/{key}"
+    
+    @staticmethod
+    def parse_location(location: str) -> tuple[str, str]:
+        bucket, _, key = location[len("s3://"):].partition("/")
+        return bucket, key
+    
+    async def commit(self, staged_path: Path, location: str):
+        bucket, key = self.parse_location(location)
+        await run_file_io("s3_put", self.client.upload_file, str(staged_path), bucket, key)
+        await delete_file(str(staged_path))
+    
+    async def head(self, location: str) -> Optional[dict]:
+        bucket, key = self.parse_location(location)
+        try:
+            return await run_file_io("s3_head", lambda: self.client.head_object(Bucket=bucket, Key=key))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") in ("404", "NoSuchKey", "NotFound"):
+                return None
+            raise
+    
+    async def exists(self, location: str) -> bool:
+        return await self.head(location) is not None
+    
+    async def stat(self, location: str) -> tuple[int, float]:
+        head = await self.head(location)
+        if head is None:
+            raise FileNotFoundError(location)
+        return head["ContentLength"], head["LastModified"].timestamp()
+    
+    async def delete(self, location: str) -> bool:
+        bucket, key = self.parse_location(location)
+        try:
+            await run_file_io("s3_delete", lambda: self.client.delete_object(Bucket=bucket, Key=key))
+            return True
+        except ClientError as e:
+            logging.error(f"Failed to delete object {location}: {str(e)}")
+            return False
+    
+    async def download(self, location: str, local_path: Path):
+        bucket, key = self.parse_location(location)
+        await run_file_io("s3_get", self.client.download_file, bucket, key, str(local_path))
+    
+    async def iter_stale(self, prefix: str, cutoff: float):
+        """Batches of locations under prefix last modified before cutoff, one per listing page"""
+        pages = iter(self.client.get_paginator("list_objects_v2").paginate(Bucket=self.bucket, Prefix=f"{prefix}/"))
+        while True:
+            page = await run_file_io("s3_list", next, pages, None)
+            if page is None:
+                break
+            yield [
+                self.location_for(obj["Key"]) for obj in page.get("Contents", [])
+                if obj["LastModified"].timestamp() < cutoff
+            ]
+    
+    async def iter_range(self, location: str, start: int, end: int):
+        bucket, key = self.parse_location(location)
+        response = await run_file_io(
+            "s3_get", lambda: self.client.get_object(Bucket=bucket, Key=key, Range=f"bytes={start}-{end}")
+        )
+        body = response["Body"]
+        try:
+            while True:
+                chunk = await run_file_io("s3_read", body.read, DOWNLOAD_CHUNK_SIZE)
+                if not chunk:
+                    break
+                yield chunk
+        finally:
+            body.close()
+    
+    async def presigned_get_url(self, location: str, filename: str, media_type: str) -> str:
+        bucket, key = self.parse_location(location)
+        return await run_file_io("s3_presign", lambda: self.client.generate_presigned_url(
+            "get_object",
+            Params={
+                "Bucket": bucket,
+                "Key": key,
+                "ResponseContentDisposition": content_disposition(filename),
+                "ResponseContentType": media_type
+            },
+            ExpiresIn=PRESIGNED_URL_EXPIRY
+        ))
+    
+    async def presigned_put_url(self, location: str, content_type: Optional[str], size: int, content_hash: str) -> tuple[str, dict]:
+        """Presigned PUT bound to the object's length and SHA-256, so S3 rejects any other bytes"""
+        bucket, key = self.parse_location(location)
+        checksum = base64.b64encode(bytes.fromhex(content_hash)).decode()
+        params = {"Bucket": bucket, "Key": key, "ContentLength": size, "ChecksumSHA256": checksum}
+        headers = {"Content-Length": str(size), "x-amz-checksum-sha256": checksum}
+        if content_type:
+            params["ContentType"] = content_type
+            headers["Content-Type"] = content_type
+        url = await run_file_io("s3_presign", lambda: self.client.generate_presigned_url(
+            "put_object", Params=params, ExpiresIn=PRESIGNED_URL_EXPIRY
+        ))
+        return url, headers
+
+storage_backends: Dict[str, Any] = {"local": LocalStorageBackend()}
+if S3_BUCKET:
+    storage_backends["s3"] = S3StorageBackend(S3_BUCKET, S3_ENDPOINT_URL, S3_REGION)
+if STORAGE_BACKEND not in storage_backends:
+    raise RuntimeError(f"Storage backend '{STORAGE_BACKEND}' is not configured (set S3_BUCKET for s3)")
+storage_backend = storage_backends[STORAGE_BACKEND]
+
+def get_storage_backend(location: str):
+    """Backend that owns a stored location"""
+    if location.startswith("s3://"):
+        if "s3" not in storage_backends:
+            raise HTTPException(status_code=500, detail="S3 storage is not configured")
+        return storage_backends["s3"]
+    return storage_backends["local"]
+
+# Content-addressed blob store
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+def get_blob_key(content_hash: str) -> str:
+    """Storage key for a SHA-256 digest: blobs/ab/cd/abcd..."""
+    return f"blobs/{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+async def add_blob_reference(content_hash: str, size: int, location: Optional[str] = None) -> dict:
+    """Increment the blob's reference count, creating its record on first use.
+
+    A record marked deleting is never referenced: the upsert then collides with
+    it on the unique sha256 index, and we wait for remove_blob to drop it
+    before creating a fresh record.
+    """
+    for _ in range(BLOB_ACQUIRE_RETRIES):
+        try:
+            blob = await db.file_blobs.find_one_and_update(
+                {"sha256": content_hash, "deleting": {"$ne": True}},
+                {
+                    "$inc": {"ref_count": 1},
+                    "$setOnInsert": {
+                        "sha256": content_hash,
+                        "path": location or storage_backend.location_for(get_blob_key(content_hash)),
+                        "size": size,
+                        "created_at": datetime.utcnow()
+                    }
+                },
+                upsert=True,
+                return_document=ReturnDocument.AFTER
+            )
+            break
+        except DuplicateKeyError:
+            await asyncio.sleep(BLOB_ACQUIRE_RETRY_DELAY)
+    else:
+        raise HTTPException(status_code=503, detail="Stored file is being removed, please retry")
+    if blob["ref_count"] == 1:
+        await record_disk_change("blobs", size, 1)
+    return blob
+
+async def acquire_blob(staged_path: Path, content_hash: str, size: int) -> dict:
+    """Take a reference on the blob for content_hash, committing staged_path as its content.
+
+    The reference is counted before the file is moved into place so that a
+    concurrent release of the last reference cannot delete the record under us.
+    """
+    blob = await add_blob_reference(content_hash, size)
+    backend = get_storage_backend(blob["path"])
+    
+    if blob["ref_count"] == 1 or not await backend.exists(blob["path"]):
+        await backend.commit(staged_path, blob["path"])
+    else:
+        await delete_file(str(staged_path))
+    
+    return serialize_doc(blob)
+
+async def release_blob(content_hash: str) -> bool:
+    """Drop one reference to a blob, removing the blob once nothing points at it"""
+    blob = await db.file_blobs.find_one_and_update(
+        {"sha256": content_hash, "deleting": {"$ne": True}},
+        {"$inc": {"ref_count": -1}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not blob:
+        return False
+    
+    if blob["ref_count"] <= 0:
+        await remove_blob(content_hash)
+    return True
+
+async def remove_blob(content_hash: str) -> bool:
+    """Delete an unreferenced blob's content, then its record.
+
+    The record is first marked deleting so add_blob_reference cannot revive it
+    while the file is unlinked. If the content cannot be removed the mark is
+    cleared and the unreferenced record is retried by the orphan scan; a mark
+    left behind by a crash is taken over once it is ORPHAN_GRACE_PERIOD old.
+    """
+    now = datetime.utcnow()
+    blob = await db.file_blobs.find_one_and_update(
+        {
+            "sha256": content_hash,
+            "ref_count": {"$lte": 0},
+            "$or": [{"deleting": {"$ne": True}}, {"deleting_at": {"$lt": now - ORPHAN_GRACE_PERIOD}}]
+        },
+        {"$set": {"deleting": True, "deleting_at": now}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not blob:
+        return False  # Re-referenced, or another worker is removing it
+    
+    backend = get_storage_backend(blob["path"])
+    try:
+        await backend.delete(blob["path"])
+        if await backend.exists(blob["path"]):
+            raise RuntimeError("content still present after delete")
+        await delete_derivatives(blob["path"])
+    except Exception as e:
+        logging.error(f"Failed to remove blob {content_hash}: {str(e)}")
+        await db.file_blobs.update_one(
+            {"sha256": content_hash, "deleting": True},
+            {"$unset": {"deleting": "", "deleting_at": ""}}
+        )
+        return False
+    
+    await db.file_blobs.delete_one({"sha256": content_hash, "deleting": True})
+    await record_disk_change("blobs", -blob["size"], -1)
+    return True
+
+# Image derivatives (thumbnails and previews)
+derivative_executor: Optional[ProcessPoolExecutor] = None
+derivative_jobs: Dict[str, asyncio.Future] = {}  # In-flight renders keyed by original path
+derivative_tasks: set = set()  # Keeps fire-and-forget render tasks referenced
+
+def get_derivative_executor() -> ProcessPoolExecutor:
+    """Create the render pool on first use; spawned workers only import derivatives.py"""
+    global derivative_executor
+    if derivative_executor is None:
+        derivative_executor = ProcessPoolExecutor(
+            max_workers=DERIVATIVE_WORKERS, mp_context=multiprocessing.get_context("spawn")
+        )
+    return derivative_executor
+
+def get_derivative_location(location: str, variant: str) -> str:
+    """Derivatives sit next to the original: <location>.<variant>.<ext>"""
+    return f"{location}.{variant}.{DERIVATIVE_VARIANTS[variant]['extension']}"
+
+async def render_remote_derivatives(location: str) -> Dict[str, str]:
+    """Render derivatives for an object in remote storage from a local temp copy"""
+    backend = get_storage_backend(location)
+    local_copy = TEMP_DIR / f"render_{uuid.uuid4().hex}"
+    try:
+        await backend.download(location, local_copy)
+        rendered = await asyncio.get_running_loop().run_in_executor(
+            get_derivative_executor(), render_derivatives, str(local_copy), list(DERIVATIVE_VARIANTS)
+        )
+        for variant, local_path in rendered.items():
+            await backend.commit(Path(local_path), get_derivative_location(location, variant))
+        return {variant: get_derivative_location(location, variant) for variant in rendered}
+    finally:
+        await delete_file(str(local_copy))
+
+async def ensure_derivatives(original_path: str) -> Dict[str, str]:
+    """Render any missing derivatives of an image, sharing a render already in flight"""
+    job = derivative_jobs.get(original_path)
+    if job is None:
+        if get_storage_backend(original_path).name == "local":
+            job = asyncio.get_running_loop().run_in_executor(
+                get_derivative_executor(), render_derivatives, original_path, list(DERIVATIVE_VARIANTS)
+            )
+        else:
+            job = asyncio.ensure_future(render_remote_derivatives(original_path))
+        derivative_jobs[original_path] = job
+        job.add_done_callback(lambda _: derivative_jobs.pop(original_path, None))
+    return await asyncio.shield(job)
+
+def schedule_derivatives(original_path: str):
+    """Render derivatives in the background after an image upload"""
+    async def render():
+        try:
+            await ensure_derivatives(original_path)
+        except Exception as e:
+            logging.error(f"Derivative rendering failed for {original_path}: {str(e)}")
+    
+    task = asyncio.create_task(render())
+    derivative_tasks.add(task)
+    task.add_done_callback(derivative_tasks.discard)
+
+def get_derivative_original(location: str) -> str:
+    """Location of the original a derivative was rendered from (or location itself)"""
+    for variant, spec in DERIVATIVE_VARIANTS.items():
+        suffix = f".{variant}.{spec['extension']}"
+        if location.endswith(suffix):
+            return location[:-len(suffix)]
+    return location
+
+async def delete_derivatives(original_path: str):
+    backend = get_storage_backend(original_path)
+    for variant in DERIVATIVE_VARIANTS:
+        location = get_derivative_location(original_path, variant)
+        if await backend.exists(location):
+            await backend.delete(location)
+
+# Storage ledger: incrementally maintained byte/file counters
+#   type:<portfolio|evidence>, user:<id>, month:<yyyy-mm>  logical bytes per stored reference
+#   disk:<blobs|legacy|temp>                                physical bytes on disk
+def storage_ledger_update(scope: str, value: str, bytes_delta: int, files_delta: int) -> UpdateOne:
+    return UpdateOne(
+        {"key": f"{scope}:{value}"},
+        {
+            "$inc": {"bytes": bytes_delta, "files": files_delta},
+            "$set": {"updated_at": datetime.utcnow()},
+            "$setOnInsert": {"scope": scope, "value": value}
+        },
+        upsert=True
+    )
+
+async def record_storage_change(file_type: str, user_id: str, stored_at: datetime, bytes_delta: int, files_delta: int):
+    """Apply a stored-file delta to the type, user and month counters.
+
+    Failures are logged rather than raised; the reconcile endpoint repairs drift.
+    """
+    month = stored_at.strftime("%Y-%m")
+    try:
+        await db.storage_ledger.bulk_write([
+            storage_ledger_update("type", file_type, bytes_delta, files_delta),
+            storage_ledger_update("user", user_id, bytes_delta, files_delta),
+            storage_ledger_update("month", month, bytes_delta, files_delta)
+        ], ordered=False)
+    except Exception as e:
+        logging.error(f"Storage ledger update failed for {file_type}/{user_id}: {str(e)}")
+
+async def record_disk_change(area: str, bytes_delta: int, files_delta: int):
+    """Apply a physical on-disk delta (blobs or legacy per-item files)"""
+    try:
+        await db.storage_ledger.bulk_write([storage_ledger_update("disk", area, bytes_delta, files_delta)])
+    except Exception as e:
+        logging.error(f"Storage ledger update failed for disk:{area}: {str(e)}")
+
+def get_directory_size(directory: Path) -> tuple[int, int]:
+    """Get total size and file count of directory (blocking walk)"""
+    total_size = 0
+    file_count = 0
+    
+    if directory.exists():
+        for file_path in directory.rglob("*"):
+            if file_path.is_file():
+                total_size += file_path.stat().st_size
+                file_count += 1
+    
+    return total_size, file_count
+
+def stat_file_sizes(file_paths: List[str]) -> List[Optional[int]]:
+    """Sizes of a batch of files, None for files missing on disk (blocking)"""
+    sizes = []
+    for file_path in file_paths:
+        try:
+            sizes.append(os.stat(file_path).st_size)
+        except OSError:
+            sizes.append(None)
+    return sizes
+
+async def stat_locations(locations: List[str]) -> List[Optional[int]]:
+    """Sizes of stored locations, None where missing; local paths are stat'ed in one executor call"""
+    local = [loc for loc in locations if get_storage_backend(loc).name == "local"]
+    local_sizes = dict(zip(local, await run_file_io("stat", stat_file_sizes, local)))
+    sizes = []
+    for location in locations:
+        if location in local_sizes:
+            sizes.append(local_sizes[location])
+            continue
+        try:
+            size, _ = await get_storage_backend(location).stat(location)
+            sizes.append(size)
+        except FileNotFoundError:
+            sizes.append(None)
+    return sizes
+
+async def reconcile_storage_ledger() -> dict:
+    """Rebuild the storage ledger from the database records and the stored files.
+
+    Every record that points at a file is stat'ed in batches; records whose
+    file is missing are counted but not added.
+    """
+    counters: Dict[tuple[str, str], List[int]] = {}
+    missing_files = 0
+    legacy_paths = set()
+    
+    def add(scope: str, value: str, size: int):
+        entry = counters.setdefault((scope, value), [0, 0])
+        entry[0] += size
+        entry[1] += 1
+    
+    sources = [
+        ("portfolio", db.portfolio_items, {"status": "active", "file_path": {"$ne": None}},
+         "file_path", "content_hash", "upload_date"),
+        ("evidence", db.task_completions, {"evidence_file_path": {"$ne": None}},
+         "evidence_file_path", "evidence_content_hash", "completed_at")
+    ]
+    for file_type, collection, query, path_field, hash_field, date_field in sources:
+        cursor = collection.find(query, {"_id": 0, "user_id": 1, path_field: 1, hash_field: 1, date_field: 1})
+        batch = await cursor.to_list(500)
+        while batch:
+            sizes = await stat_locations([doc[path_field] for doc in batch])
+            for doc, size in zip(batch, sizes):
+                if size is None:
+                    missing_files += 1
+                    continue
+                stored_at = doc.get(date_field) or datetime.utcnow()
+                add("type", file_type, size)
+                add("user", doc["user_id"], size)
+                add("month", stored_at.strftime("%Y-%m"), size)
+                if not doc.get(hash_field):
+                    legacy_paths.add(doc[path_field])
+            batch = await cursor.to_list(500)
+    
+    # Physical usage: referenced blobs that exist, legacy per-item files and staging
+    blob_size, blob_files = 0, 0
+    cursor = db.file_blobs.find({"ref_count": {"$gt": 0}}, {"_id": 0, "path": 1})
+    batch = await cursor.to_list(500)
+    while batch:
+        for size in await stat_locations([blob["path"] for blob in batch]):
+            if size is not None:
+                blob_size += size
+                blob_files += 1
+        batch = await cursor.to_list(500)
+    temp_size, temp_files = await run_file_io("scan", get_directory_size, TEMP_DIR)
+    legacy_sizes = await stat_locations(list(legacy_paths))
+    counters[("disk", "blobs")] = [blob_size, blob_files]
+    counters[("disk", "temp")] = [temp_size, temp_files]
+    counters[("disk", "legacy")] = [
+        sum(size or 0 for size in legacy_sizes), sum(1 for size in legacy_sizes if size is not None)
+    ]
+    
+    now = datetime.utcnow()
+    keys = [f"{scope}:{value}" for scope, value in counters]
+    await db.storage_ledger.bulk_write([
+        ReplaceOne(
+            {"key": f"{scope}:{value}"},
+            {"key": f"{scope}:{value}", "scope": scope, "value": value,
+             "bytes": size, "files": files, "updated_at": now, "reconciled_at": now},
+            upsert=True
+        )
+        for (scope, value), (size, files) in counters.items()
+    ], ordered=False)
+    removed = await db.storage_ledger.delete_many({"key": {"$nin": keys}})
+    
+    return {
+        "counters": len(keys),
+        "removed_counters": removed.deleted_count,
+        "records_missing_files": missing_files,
+        "reconciled_at": now
+    }
+
+# Resumable upload sessions
+def get_upload_session_path(upload_id: str) -> Path:
+    """Staging file for a resumable upload session"""
+    return UPLOAD_SESSION_DIR / f"{upload_id}.part"
+
+def hash_file(file_path: Path) -> str:
+    """SHA-256 of a file on disk, read in UPLOAD_CHUNK_SIZE pieces"""
+    hasher = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(UPLOAD_CHUNK_SIZE), b""):
+            hasher.update(chunk)
+    return hasher.hexdigest()
+
+async def commit_upload_session(upload_id: str, file_type: str, user_id: str, file_id: str) -> dict:
+    """Move a fully received upload session into the blob store.
+
+    Returns the same file metadata as save_uploaded_file. The session is claimed
+    with a status transition so it can only be committed once.
+    """
+    session = await db.upload_sessions.find_one_and_update(
+        {"id": upload_id, "user_id": user_id, "status": "uploading"},
+        {"$set": {"status": "committing", "committing_since": datetime.utcnow()}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    
+    try:
+        if session.get("mode") == "direct":
+            blob = await reference_direct_upload(session)
+        else:
+            if session["offset"] != session["total_size"]:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Upload incomplete: received {session['offset']} of {session['total_size']} bytes"
+                )
+            staging_path = get_upload_session_path(upload_id)
+            content_hash = await run_file_io("hash", hash_file, staging_path)
+            blob = await acquire_blob(staging_path, content_hash, session["total_size"])
+    except HTTPException:
+        await db.upload_sessions.update_one({"id": upload_id}, {"$set": {"status": "uploading"}, "$unset": {"committing_since": ""}})
+        raise
+    except Exception as e:
+        await db.upload_sessions.update_one({"id": upload_id}, {"$set": {"status": "uploading"}, "$unset": {"committing_since": ""}})
+        raise HTTPException(status_code=500, detail=f"Failed to commit upload: {str(e)}")
+    
+    await db.upload_sessions.delete_one({"id": upload_id})
+    await record_storage_change(file_type, user_id, datetime.utcnow(), session["total_size"], 1)
+    
+    return {
+        "file_path": blob["path"],
+        "content_hash": blob["sha256"],
+        "original_filename": session["filename"],
+        "secure_filename": generate_secure_filename(session["filename"], file_id),
+        "file_size": session["total_size"],
+        "mime_type": session.get("content_type"),
+        "file_type": file_type
+    }
+
+async def reference_direct_upload(session: dict) -> dict:
+    """Take a blob reference for an object the client PUT straight to storage.
+
+    The reference is taken before the object is checked, so a concurrent
+    remove_blob for the same hash cannot unlink it after the check.
+    """
+    location = session["blob_location"]
+    blob = await add_blob_reference(session["content_hash"], session["total_size"], location)
+    try:
+        size, _ = await get_storage_backend(blob["path"]).stat(blob["path"])
+    except FileNotFoundError:
+        size = None
+    if size != session["total_size"]:
+        await release_blob(session["content_hash"])
+        raise HTTPException(status_code=400, detail="Direct upload has not been received yet")
+    return serialize_doc(blob)
+
+async def discard_direct_upload(session: dict):
+    """Delete the object an abandoned direct upload PUT, unless a blob record or another live session uses it"""
+    content_hash = session["content_hash"]
+    if await db.file_blobs.find_one({"sha256": content_hash}, {"_id": 1}):
+        return
+    if await db.upload_sessions.find_one(
+        {"content_hash": content_hash, "status": {"$in": ["uploading", "committing"]}}, {"_id": 1}
+    ):
+        return
+    await get_storage_backend(session["blob_location"]).delete(session["blob_location"])
+
+async def expire_upload_sessions() -> int:
+    """Remove abandoned upload sessions with their staging files or directly uploaded objects.
+
+    Besides expired uploads this picks up sessions a crashed commit left in
+    committing, which would otherwise keep their content hash in flight forever.
+    """
+    now = datetime.utcnow()
+    expired = await db.upload_sessions.find(
+        {"$or": [
+            {"status": "uploading", "expires_at": {"$lt": now}},
+            {"status": "committing", "committing_since": {"$lt": now - UPLOAD_COMMIT_TIMEOUT}},
+            {"status": "committing", "committing_since": None, "expires_at": {"$lt": now}}
+        ]},
+        {"id": 1, "status": 1, "mode": 1, "content_hash": 1, "blob_location": 1}
+    ).to_list(1000)
+    
+    for session in expired:
+        result = await db.upload_sessions.delete_one({"id": session["id"], "status": session["status"]})
+        if result.deleted_count:
+            if session.get("mode") == "direct":
+                await discard_direct_upload(session)
+            else:
+                await delete_file(str(get_upload_session_path(session["id"])))
+    
+    return len(expired)
+
+# Deferred garbage collection
+async def enqueue_file_deletion(location: str, content_hash: Optional[str] = None, file_size: Optional[int] = None):
+    """Queue a stored file for removal by the storage sweeper"""
+    await db.file_deletion_queue.insert_one({
+        "id": str(uuid.uuid4()),
+        "location": location,
+        "content_hash": content_hash,
+        "file_size": file_size,
+        "attempts": 0,
+        "enqueued_at": datetime.utcnow(),
+        "not_before": datetime.utcnow()
+    })
+
+async def gc_throttle():
+    """Pace sweeper I/O and back off while foreground file I/O is queueing"""
+    await asyncio.sleep(GC_ITEM_DELAY)
+    while file_io_metrics.queue_depth() > GC_MAX_FOREGROUND_QUEUE:
+        await asyncio.sleep(GC_ITEM_DELAY * 10)
+
+async def claim_deletion_batch() -> List[dict]:
+    """Take up to GC_BATCH_SIZE due entries off the deletion queue.
+
+    Entries are tagged with a claim id (so concurrent sweepers split the work)
+    and removed from the queue before any file is touched.
+    """
+    now = datetime.utcnow()
+    candidates = await db.file_deletion_queue.find(
+        {
+            "attempts": {"$lt": GC_MAX_ATTEMPTS},
+            "not_before": {"$not": {"$gt": now}},
+            "$or": [{"claimed_by": None}, {"claimed_at": {"$lt": now - GC_CLAIM_TIMEOUT}}]
+        },
+        {"id": 1}
+    ).sort("enqueued_at", 1).to_list(GC_BATCH_SIZE)
+    if not candidates:
+        return []
+    
+    claim_id = str(uuid.uuid4())
+    await db.file_deletion_queue.update_many(
+        {
+            "id": {"$in": [entry["id"] for entry in candidates]},
+            "$or": [{"claimed_by": None}, {"claimed_at": {"$lt": now - GC_CLAIM_TIMEOUT}}]
+        },
+        {"$set": {"claimed_by": claim_id, "claimed_at": now}}
+    )
+    entries = await db.file_deletion_queue.find({"claimed_by": claim_id}, {"_id": 0}).to_list(None)
+    await db.file_deletion_queue.delete_many({"claimed_by": claim_id})
+    return entries
+
+async def process_deletion_queue() -> int:
+    """Release blobs and delete legacy files queued by deletes, in batches.
+
+    Each batch is removed from the queue before any file is touched, so a crash
+    can leak a file (found later by the orphan scan) but can never release the
+    same blob reference twice. A failed entry goes back on the queue with an
+    exponential not_before backoff.
+    """
+    processed = 0
+    while processed < GC_BATCH_SIZE * 10:
+        entries = await claim_deletion_batch()
+        if not entries:
+            break
+        for entry in entries:
+            try:
+                if entry.get("content_hash"):
+                    await release_blob(entry["content_hash"])
+                else:
+                    if await get_storage_backend(entry["location"]).delete(entry["location"]):
+                        await record_disk_change("legacy", -(entry.get("file_size") or 0), -1)
+                    await delete_derivatives(entry["location"])
+                processed += 1
+            except Exception as e:
+                logging.error(f"Deferred delete of {entry['location']} failed: {str(e)}")
+                for field in ("claimed_by", "claimed_at"):
+                    entry.pop(field, None)
+                entry["attempts"] += 1
+                entry["last_error"] = str(e)
+                entry["not_before"] = datetime.utcnow() + GC_RETRY_DELAY * 2 ** (entry["attempts"] - 1)
+                await db.file_deletion_queue.insert_one(entry)
+            await gc_throttle()
+    return processed
+
+def list_files_older_than(directory: Path, cutoff: float) -> List[str]:
+    """Files under directory last modified before cutoff (blocking walk)"""
+    stale = []
+    if directory.exists():
+        for file_path in directory.rglob("*"):
+            try:
+                if file_path.is_file() and file_path.stat().st_mtime < cutoff:
+                    stale.append(str(file_path))
+            except OSError:
+                continue
+    return stale
+
+async def sweep_temp_files() -> int:
+    """Remove old staging files from TEMP_DIR that no live upload session owns"""
+    stale = await run_file_io(
+        "scan", list_files_older_than, TEMP_DIR, time.time() - TEMP_FILE_MAX_AGE.total_seconds()
+    )
+    session_ids = [Path(path).stem for path in stale if Path(path).parent == UPLOAD_SESSION_DIR]
+    live = {
+        session["id"] for session in await db.upload_sessions.find(
+            {"id": {"$in": session_ids}, "status": "uploading", "expires_at": {"$gte": datetime.utcnow()}},
+            {"id": 1}
+        ).to_list(None)
+    }
+    
+    removed = 0
+    for path in stale:
+        if Path(path).parent == UPLOAD_SESSION_DIR and Path(path).stem in live:
+            continue
+        if await delete_file(path):
+            removed += 1
+        await gc_throttle()
+    return removed
+
+async def scan_for_orphans() -> dict:
+    """Reconcile stored files against their records.
+
+    Blob files and objects, in every configured backend, without a file_blobs
+    record or a live direct upload session are removed (blobs are always
+    recorded before they are written). Legacy files nothing points at, and
+    records whose file is missing, are only reported.
+    """
+    started_at = datetime.utcnow()
+    grace_cutoff = time.time() - ORPHAN_GRACE_PERIOD.total_seconds()
+    orphan_blobs_removed = 0
+    unreferenced_files: List[str] = []
+    missing: List[dict] = []
+    
+    def base_name(path: str) -> str:
+        return Path(path).name.split(".")[0]
+    
+    # Blob files (and their derivatives) with no record
+    for backend in storage_backends.values():
+        async for files in backend.iter_stale("blobs", grace_cutoff):
+            hashes = list({base_name(path) for path in files})
+            known = {
+                blob["sha256"] for blob in await db.file_blobs.find(
+                    {"sha256": {"$in": hashes}}, {"sha256": 1}
+                ).to_list(None)
+            } | {
+                session["content_hash"] for session in await db.upload_sessions.find(
+                    {"content_hash": {"$in": hashes}, "status": {"$in": ["uploading", "committing"]}},
+                    {"content_hash": 1}
+                ).to_list(None)
+            }
+            for path in files:
+                if base_name(path) not in known:
+                    if await backend.delete(path):
+                        orphan_blobs_removed += 1
+                    await gc_throttle()
+    
+    # Unreferenced blob records whose removal failed or was interrupted
+    stale_blobs = await db.file_blobs.find({"ref_count": {"$lte": 0}}, {"sha256": 1}).to_list(None)
+    for blob in stale_blobs:
+        if await remove_blob(blob["sha256"]):
+            orphan_blobs_removed += 1
+        await gc_throttle()
+    
+    # Legacy per-item files with no live record
+    for directory in [PORTFOLIO_DIR, EVIDENCE_DIR]:
+        files = await run_file_io("scan", list_files_older_than, directory, grace_cutoff)
+        for start in range(0, len(files), GC_BATCH_SIZE):
+            batch = files[start:start + GC_BATCH_SIZE]
+            # Derivatives count as referenced when their original is
+            originals = {path: get_derivative_original(path) for path in batch}
+            candidates = list(set(originals.values()))
+            referenced = {
+                item["file_path"] for item in await db.portfolio_items.find(
+                    {"file_path": {"$in": candidates}, "status": {"$ne": "deleted"}}, {"file_path": 1}
+                ).to_list(None)
+            } | {
+                completion["evidence_file_path"] for completion in await db.task_completions.find(
+                    {"evidence_file_path": {"$in": candidates}}, {"evidence_file_path": 1}
+                ).to_list(None)
+            }
+            unreferenced_files.extend(path for path in batch if originals[path] not in referenced)
+            await gc_throttle()
+    
+    # Records pointing at files that no longer exist
+    sources = [
+        ("portfolio", db.portfolio_items, {"status": "active", "file_path": {"$ne": None}}, "file_path"),
+        ("evidence", db.task_completions, {"evidence_file_path": {"$ne": None}}, "evidence_file_path")
+    ]
+    for file_type, collection, query, path_field in sources:
+        cursor = collection.find(query, {"_id": 0, "id": 1, path_field: 1})
+        batch = await cursor.to_list(GC_BATCH_SIZE)
+        while batch:
+            sizes = await stat_locations([doc[path_field] for doc in batch])
+            missing.extend(
+                {"file_type": file_type, "id": doc["id"], "location": doc[path_field]}
+                for doc, size in zip(batch, sizes) if size is None
+            )
+            await gc_throttle()
+            batch = await cursor.to_list(GC_BATCH_SIZE)
+    
+    report = {
+        "id": "orphan_scan",
+        "started_at": started_at,
+        "finished_at": datetime.utcnow(),
+        "orphan_blobs_removed": orphan_blobs_removed,
+        "unreferenced_file_count": len(unreferenced_files),
+        "unreferenced_files": unreferenced_files[:100],
+        "records_missing_files_count": len(missing),
+        "records_missing_files": missing[:100]
+    }
+    await db.gc_reports.replace_one({"id": "orphan_scan"}, report, upsert=True)
+    return report
+
+async def storage_sweeper():
+    """Background loop for deferred deletes, abandoned uploads, stale temp files and orphan scans"""
+    while True:
+        try:
+            deleted = await process_deletion_queue()
+            expired = await expire_upload_sessions()
+            temp_removed = await sweep_temp_files()
+            if deleted or expired or temp_removed:
+                logging.info(
+                    f"Storage sweep: {deleted} queued deletes, {expired} expired upload sessions, "
+                    f"{temp_removed} stale temp files"
+                )
+            
+            last_scan = await db.gc_reports.find_one({"id": "orphan_scan"}, {"finished_at": 1})
+            if not last_scan or last_scan["finished_at"] < datetime.utcnow() - ORPHAN_SCAN_INTERVAL:
+                report = await scan_for_orphans()
+                logging.info(
+                    f"Orphan scan: removed {report['orphan_blobs_removed']} blobs, "
+                    f"{report['unreferenced_file_count']} unreferenced files, "
+                    f"{report['records_missing_files_count']} records missing files"
+                )
+        except Exception as e:
+            logging.error(f"Storage sweep failed: {str(e)}")
+        await asyncio.sleep(GC_SWEEP_INTERVAL)
+
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
@@ -220,7 +1250,7 @@ async def get_current_admin(credentials: HTTPAuthorizationCredentials = Depends(
     return serialize_doc(user)
 
 # Create the main app without a prefix
-app = FastAPI()
+app = FastAPI(default_response_class=FastJSONResponse)
 
 # Create a router with the /api prefix
 api_router = APIRouter(prefix="/api")
@@ -298,6 +1328,9 @@ class TaskCompletion(BaseModel):
     completed_at: datetime = Field(default_factory=datetime.utcnow)
     evidence_description: Optional[str] = None
     evidence_file_path: Optional[str] = None
+    evidence_content_hash: Optional[str] = None  # SHA-256 of the evidence blob
+    evidence_original_filename: Optional[str] = None
+    evidence_mime_type: Optional[str] = None
     verified_by: Optional[str] = None  # mentor/manager id
     verified_at: Optional[datetime] = None
     notes: Optional[str] = None
@@ -313,6 +1346,11 @@ class AdminStats(BaseModel):
     total_completions: int
     completion_rate: float
     active_competency_areas: int
+    area_completion_rates: Dict[str, float] = {}  # mean participant progress per competency area
+    active_users_7d: int = 0
+    active_users_30d: int = 0
+    completions_per_day: List[Dict[str, Any]] = []  # [{"date": "yyyy-mm-dd", "completions": n}], last 30 days
+    generated_at: datetime = Field(default_factory=datetime.utcnow)
 
 class CompetencyProgress(BaseModel):
     user_id: str
@@ -331,6 +1369,7 @@ class PortfolioItem(BaseModel):
     description: str
     competency_areas: List[str] = []  # which competencies this supports
     file_path: Optional[str] = None
+    content_hash: Optional[str] = None  # SHA-256 of the file blob
     original_filename: Optional[str] = None
     secure_filename: Optional[str] = None
     file_size: Optional[int] = None
@@ -343,6 +1382,31 @@ class PortfolioItem(BaseModel):
     status: str = "active"  # active, archived, deleted
     tags: List[str] = []
 
+class UploadSessionCreate(BaseModel):
+    user_id: str
+    filename: str
+    content_type: Optional[str] = None
+    total_size: int
+
+class DirectUploadCreate(UploadSessionCreate):
+    sha256: str  # hex digest of the file, enforced by the storage service on PUT
+
+class UploadSession(BaseModel):
+    id: str = Field(default_factory=lambda: str(uuid.uuid4()))
+    user_id: str
+    filename: str
+    content_type: Optional[str] = None
+    total_size: int
+    offset: int = 0
+    status: str = "uploading"  # uploading, committing
+    committing_since: Optional[datetime] = None  # set when a commit claims the session
+    mode: str = "resumable"  # resumable (PATCH through the API), direct (presigned PUT to storage)
+    content_hash: Optional[str] = None  # direct mode: SHA-256 declared by the client
+    blob_location: Optional[str] = None  # direct mode: where the client PUTs the object
+    locked_until: Optional[datetime] = None  # set while a PATCH is writing
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    expires_at: datetime = Field(default_factory=lambda: datetime.utcnow() + UPLOAD_SESSION_TTL)
+
 class PortfolioItemCreate(BaseModel):
     title: str
     description: str
@@ -697,83 +1761,1059 @@ SAMPLE_TASKS = [
     }
 ]
 
-async def calculate_competency_progress(user_id: str, competency_area: str, sub_competency: str):
-    """Calculate progress percentage for a specific sub-competency based on completed tasks"""
-    # Get all tasks for this sub-competency
-    tasks = await db.tasks.find({
-        "competency_area": competency_area,
-        "sub_competency": sub_competency,
-        "active": True
-    }).to_list(1000)
+# Task catalog cache
+# Each worker keeps the whole task catalog in memory. Admin changes bump a
+# version number in Mongo, and workers compare it at most once per
+# TASK_CATALOG_MAX_STALENESS seconds, so a change is visible everywhere within
+# that window (immediately in the worker that made it).
+TASK_CATALOG_MAX_STALENESS = float(os.environ.get('TASK_CATALOG_MAX_STALENESS', '5'))  # Seconds
+
+class TaskCatalog:
+    def __init__(self):
+        self.version: Optional[int] = None
+        self.tasks: List[dict] = []  # Active tasks by competency_area, sub_competency, order
+        self.by_id: Dict[str, dict] = {}  # All tasks, including inactive ones
+        self.by_slice: Dict[tuple[str, str], List[dict]] = {}  # Active tasks by order
+        self.checked_at = 0.0
+        self.lock = asyncio.Lock()
     
-    if not tasks:
-        return 0.0, 0, 0
+    async def current_version(self) -> int:
+        doc = await db.catalog_versions.find_one({"id": "tasks"})
+        return doc["version"] if doc else 0
     
-    total_tasks = len(tasks)
+    async def load(self, version: int):
+        tasks = await db.tasks.find({}, {"_id": 0}).to_list(None)
+        active = sorted(
+            (task for task in tasks if task.get("active", True)),
+            key=lambda task: null_first_key(task, TASK_LIST_SORT)
+        )
+        by_slice = {}
+        for task in active:
+            by_slice.setdefault((task["competency_area"], task["sub_competency"]), []).append(task)
+        
+        self.tasks = active
+        self.by_id = {task["id"]: task for task in tasks}
+        self.by_slice = by_slice
+        self.version = version
     
-    # Get completed tasks for this user
-    task_ids = [task["id"] for task in tasks]
-    completed = await db.task_completions.find({
-        "user_id": user_id,
-        "task_id": {"$in": task_ids}
-    }).to_list(1000)
+    async def refresh(self, force: bool = False):
+        """Reload if the stored version moved; checks Mongo at most once per staleness window"""
+        if self.is_fresh() and not force:
+            return
+        async with self.lock:
+            if self.is_fresh() and not force:
+                return
+            # Read the version before the tasks: a bump that lands mid-load
+            # leaves us on the older version, so the next check reloads again
+            version = await self.current_version()
+            if version != self.version:
+                await self.load(version)
+            self.checked_at = time.monotonic()
+    
+    def is_fresh(self) -> bool:
+        return self.version is not None and time.monotonic() - self.checked_at < TASK_CATALOG_MAX_STALENESS
+    
+    def invalidate(self):
+        self.version = None
     
-    completed_tasks = len(completed)
-    completion_percentage = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0.0
+    async def active_tasks(self) -> List[dict]:
+        await self.refresh()
+        return self.tasks
     
-    return completion_percentage, completed_tasks, total_tasks
+    async def tasks_for(self, competency_area: str, sub_competency: str) -> List[dict]:
+        await self.refresh()
+        return self.by_slice.get((competency_area, sub_competency), [])
+    
+    async def get(self, task_id: str) -> Optional[dict]:
+        await self.refresh()
+        task = self.by_id.get(task_id)
+        if task is None:
+            # Possibly created by another worker inside the staleness window
+            task = await db.tasks.find_one({"id": task_id}, {"_id": 0})
+        return task
+    
+    async def titles(self) -> Dict[str, str]:
+        await self.refresh()
+        return {task_id: task["title"] for task_id, task in self.by_id.items()}
 
-async def update_all_competency_progress(user_id: str):
-    """Recalculate all competency progress for a user"""
+task_catalog = TaskCatalog()
+
+async def bump_task_catalog_version() -> int:
+    """Record a task catalog change; call after every write to db.tasks"""
+    doc = await db.catalog_versions.find_one_and_update(
+        {"id": "tasks"},
+        {"$inc": {"version": 1}, "$set": {"updated_at": datetime.utcnow()}},
+        upsert=True,
+        return_document=ReturnDocument.AFTER
+    )
+    task_catalog.invalidate()
+    invalidate_admin_stats()
+    return doc["version"]
+
+# Background fan-out of catalog changes to stored progress
+# One job document per (area, sub_competency) slice. Every request bumps the
+# job's generation and pushes run_after forward, so a burst of admin edits is
+# recomputed in one pass once the edits settle. A request that arrives while
+# the slice is running sends it back to pending when the run finishes.
+PROGRESS_RECOMPUTE_DELAY = timedelta(seconds=2)  # Quiet period before a requested slice runs
+PROGRESS_RECOMPUTE_BATCH_SIZE = 500  # Progress records rewritten per bulk_write
+PROGRESS_RECOMPUTE_RETRIES = 5  # Passes over records that a concurrent increment changed mid-rewrite
+PROGRESS_RECOMPUTE_POLL_INTERVAL = 5  # Seconds between checks for jobs queued by other workers
+PROGRESS_RECOMPUTE_LOCK_TIMEOUT = timedelta(minutes=10)  # A running job this old is assumed abandoned
+
+async def compute_all_competency_progress(user_id: str) -> Dict[tuple[str, str], tuple[float, int, int]]:
+    """Progress for every sub-competency from the cached catalog and one aggregation over task_completions.
+
+    Returns {(competency_area, sub_competency): (percentage, completed, total)}.
+    Only active tasks count; a sub-competency without any scores 0 of 0.
+    """
+    await task_catalog.refresh()
+    completions = await db.task_completions.aggregate([
+        {"$match": {"user_id": user_id}},
+        {"$group": {"_id": "$task_id", "n": {"$sum": 1}}}
+    ]).to_list(None)
+    completed_by_task = {doc["_id"]: doc["n"] for doc in completions}
+    
+    progress = {}
     for area_key, area_data in NAVIGATOR_COMPETENCIES.items():
         for sub_key in area_data["sub_competencies"].keys():
-            percentage, completed, total = await calculate_competency_progress(user_id, area_key, sub_key)
-            
-            # Update or create competency progress record
-            await db.competency_progress.update_one(
-                {"user_id": user_id, "competency_area": area_key, "sub_competency": sub_key},
-                {
-                    "$set": {
-                        "completion_percentage": percentage,
-                        "completed_tasks": completed,
-                        "total_tasks": total,
-                        "last_updated": datetime.utcnow()
-                    },
-                    "$setOnInsert": {
-                        "evidence_items": []
-                    }
-                },
-                upsert=True
-            )
-
-# Routes
-@api_router.get("/")
-async def root():
-    return {"message": "Earn Your Wings Platform API"}
+            tasks = task_catalog.by_slice.get((area_key, sub_key))
+            if not tasks:
+                progress[(area_key, sub_key)] = (0.0, 0, 0)
+                continue
+            completed = sum(completed_by_task.get(task["id"], 0) for task in tasks)
+            total = len(tasks)
+            progress[(area_key, sub_key)] = ((completed / total) * 100, completed, total)
+    return progress
 
-# Authentication Routes
-@api_router.post("/admin/login")
-async def admin_login(login_data: AdminLogin):
-    user = await db.users.find_one({"email": login_data.email, "is_admin": True})
-    if not user:
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+# Per-user summary read model
+# user_summaries holds one document per user with the figures the admin user
+# list shows. It is rewritten from competency_progress and task_completions
+# whenever either changes for that user.
+async def refresh_user_summaries(user_ids: List[str]):
+    """Rebuild the summaries of these users with two aggregations and one bulk write"""
+    if not user_ids:
+        return
     
-    if not verify_password(login_data.password, user["password_hash"]):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
+    progress = {
+        doc["_id"]: doc for doc in await db.competency_progress.aggregate([
+            {"$match": {"user_id": {"$in": user_ids}}},
+            {"$group": {
+                "_id": {"user_id": "$user_id", "area": "$competency_area"},
+                "total": {"$sum": "$completion_percentage"},
+                "count": {"$sum": 1}
+            }},
+            {"$group": {
+                "_id": "$_id.user_id",
+                "total": {"$sum": "$total"},
+                "count": {"$sum": "$count"},
+                "areas": {"$push": {"area": "$_id.area", "total": "$total", "count": "$count"}}
+            }}
+        ]).to_list(None)
+    }
+    completions = {
+        doc["_id"]: doc for doc in await db.task_completions.aggregate([
+            {"$match": {"user_id": {"$in": user_ids}}},
+            {"$group": {"_id": "$user_id", "count": {"$sum": 1}, "last_activity": {"$max": "$completed_at"}}}
+        ]).to_list(None)
+    }
     
-    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
-    access_token = create_access_token(
-        data={"sub": user["id"]}, expires_delta=access_token_expires
-    )
-    return {"access_token": access_token, "token_type": "bearer", "user": serialize_doc(user)}
+    now = datetime.utcnow()
+    operations = []
+    for user_id in user_ids:
+        user_progress = progress.get(user_id)
+        user_completions = completions.get(user_id, {})
+        operations.append(ReplaceOne(
+            {"user_id": user_id},
+            {
+                "user_id": user_id,
+                "completed_tasks": user_completions.get("count", 0),
+                "overall_progress": round(user_progress["total"] / user_progress["count"], 1) if user_progress else 0.0,
+                "area_progress": {
+                    area["area"]: round(area["total"] / area["count"], 1)
+                    for area in user_progress["areas"]
+                } if user_progress else {},
+                "last_activity": user_completions.get("last_activity"),
+                "updated_at": now
+            },
+            upsert=True
+        ))
+    await db.user_summaries.bulk_write(operations, ordered=False)
 
-@api_router.post("/admin/create")
-async def create_admin(user_data: UserCreate):
-    """Create admin user - should be protected in production"""
-    if not user_data.is_admin or not user_data.password:
-        raise HTTPException(status_code=400, detail="Admin user requires password")
+async def rebuild_user_summaries() -> int:
+    """Backfill or repair every participant's summary; returns the number of users written"""
+    rebuilt = 0
+    cursor = db.users.find({"is_admin": {"$ne": True}}, {"id": 1})
+    batch = await cursor.to_list(PROGRESS_RECOMPUTE_BATCH_SIZE)
+    while batch:
+        await refresh_user_summaries([user["id"] for user in batch])
+        rebuilt += len(batch)
+        batch = await cursor.to_list(PROGRESS_RECOMPUTE_BATCH_SIZE)
+    return rebuilt
+
+async def backfill_user_summaries() -> int:
+    """Write summaries for participants that have none, e.g. on a database that predates them.
+
+    Runs at startup; returns the number of summaries written.
+    """
+    participants = await db.users.count_documents({"is_admin": {"$ne": True}})
+    if await db.user_summaries.count_documents({}) >= participants:
+        return 0
     
-    # Check if admin already exists
+    written = 0
+    cursor = db.users.find({"is_admin": {"$ne": True}}, {"id": 1})
+    batch = await cursor.to_list(PROGRESS_RECOMPUTE_BATCH_SIZE)
+    while batch:
+        user_ids = [user["id"] for user in batch]
+        summarized = {
+            doc["user_id"] for doc in await db.user_summaries.find(
+                {"user_id": {"$in": user_ids}}, {"user_id": 1}
+            ).to_list(None)
+        }
+        missing = [user_id for user_id in user_ids if user_id not in summarized]
+        if missing:
+            await refresh_user_summaries(missing)
+            written += len(missing)
+        batch = await cursor.to_list(PROGRESS_RECOMPUTE_BATCH_SIZE)
+    if written:
+        invalidate_admin_stats()
+    return written
+
+# Duplicate completions
+# task_completions has a unique (user_id, task_id) index. Databases from
+# before it can hold duplicates left by concurrent submits, which would stop
+# the index from building, so they are removed at startup first.
+async def dedupe_task_completions() -> int:
+    """Keep the earliest completion of each (user, task) pair and delete the rest.
+
+    Evidence of removed rows is queued for deletion and taken off the ledger,
+    and progress is recomputed for the affected users. Returns the number of
+    completions removed; a no-op once the unique index exists.
+    """
+    indexes = await db.task_completions.index_information()
+    existing = indexes.get("user_id_1_task_id_1")
+    if existing and existing.get("unique"):
+        return 0
+    
+    removed = 0
+    affected_users = set()
+    groups = db.task_completions.aggregate([
+        {"$sort": {"completed_at": 1}},
+        {"$group": {
+            "_id": {"user_id": "$user_id", "task_id": "$task_id"},
+            "ids": {"$push": "$id"},
+            "n": {"$sum": 1}
+        }},
+        {"$match": {"n": {"$gt": 1}}}
+    ], allowDiskUse=True)
+    async for group in groups:
+        duplicates = await db.task_completions.find({"id": {"$in": group["ids"][1:]}}).to_list(None)
+        for completion in duplicates:
+            if completion.get("evidence_file_path"):
+                content_hash = completion.get("evidence_content_hash")
+                blob = await db.file_blobs.find_one({"sha256": content_hash}, {"size": 1}) if content_hash else None
+                file_size = blob["size"] if blob else None
+                await enqueue_file_deletion(completion["evidence_file_path"], content_hash, file_size)
+                await record_storage_change(
+                    "evidence", completion["user_id"], completion.get("completed_at") or datetime.utcnow(), -(file_size or 0), -1
+                )
+        result = await db.task_completions.delete_many({"id": {"$in": [doc["id"] for doc in duplicates]}})
+        removed += result.deleted_count
+        affected_users.add(group["_id"]["user_id"])
+    
+    for user_id in affected_users:
+        await update_all_competency_progress(user_id)
+    # The plain index of the same key would block the unique one
+    if existing:
+        await db.task_completions.drop_index("user_id_1_task_id_1")
+    if removed:
+        invalidate_admin_stats()
+    return removed
+
+# Completion rollups
+# completion_rollups holds one document per day and per ISO week (Monday
+# start, UTC) with nested counters:
+#   {"granularity": "day", "bucket": <start>, "total": n,
+#    "areas": {area: n}, "subs": {area: {sub: n}}, "tasks": {task_id: n}}
+# Completions $inc their buckets as they happen, so a trend over any range
+# reads one small document per bucket. Time-series collections cannot take
+# $inc upserts, so this is a regular collection with a unique
+# (granularity, bucket) index.
+ROLLUP_GRANULARITIES = {"day": timedelta(days=1), "week": timedelta(weeks=1)}
+ROLLUP_MAX_BUCKETS = 400  # Largest range a trend query may cover, in buckets
+
+def rollup_bucket_start(moment: datetime, granularity: str) -> datetime:
+    day = moment.replace(hour=0, minute=0, second=0, microsecond=0)
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    return day
+
+def rollup_counter_paths(task: dict) -> List[str]:
+    area, sub = task["competency_area"], task["sub_competency"]
+    return ["total", f"areas.{area}", f"subs.{area}.{sub}", f"tasks.{task['id']}"]
+
+async def record_completion_rollups(completions: List[tuple[dict, datetime]]):
+    """Count (task, completed_at) pairs into their day and week buckets with one bulk write"""
+    increments: Dict[tuple[str, datetime], Dict[str, int]] = {}
+    for task, completed_at in completions:
+        for granularity in ROLLUP_GRANULARITIES:
+            counters = increments.setdefault((granularity, rollup_bucket_start(completed_at, granularity)), {})
+            for path in rollup_counter_paths(task):
+                counters[path] = counters.get(path, 0) + 1
+    if not increments:
+        return
+    await db.completion_rollups.bulk_write([
+        UpdateOne({"granularity": granularity, "bucket": bucket}, {"$inc": counters}, upsert=True)
+        for (granularity, bucket), counters in increments.items()
+    ], ordered=False)
+
+async def aggregate_rollup_buckets(match: dict) -> tuple[Dict[tuple[str, datetime], dict], int]:
+    """Rollup documents built from the task_completions matching match, plus the count skipped"""
+    daily = await db.task_completions.aggregate([
+        {"$match": match},
+        {"$group": {
+            "_id": {"day": {"$dateToString": {"format": "%Y-%m-%d", "date": "$completed_at"}}, "task_id": "$task_id"},
+            "n": {"$sum": 1}
+        }}
+    ]).to_list(None)
+    
+    buckets: Dict[tuple[str, datetime], dict] = {}
+    skipped = 0
+    for doc in daily:
+        task = task_catalog.by_id.get(doc["_id"]["task_id"])
+        if not task or not doc["_id"]["day"]:
+            skipped += doc["n"]  # Completions of deleted tasks or without a timestamp
+            continue
+        day = datetime.strptime(doc["_id"]["day"], "%Y-%m-%d")
+        for granularity in ROLLUP_GRANULARITIES:
+            bucket = rollup_bucket_start(day, granularity)
+            counters = buckets.setdefault((granularity, bucket), {
+                "granularity": granularity, "bucket": bucket, "total": 0, "areas": {}, "subs": {}, "tasks": {}
+            })
+            area, sub = task["competency_area"], task["sub_competency"]
+            counters["total"] += doc["n"]
+            counters["areas"][area] = counters["areas"].get(area, 0) + doc["n"]
+            area_subs = counters["subs"].setdefault(area, {})
+            area_subs[sub] = area_subs.get(sub, 0) + doc["n"]
+            counters["tasks"][task["id"]] = counters["tasks"].get(task["id"], 0) + doc["n"]
+    return buckets, skipped
+
+async def backfill_completion_rollups() -> dict:
+    """Rebuild every bucket from task_completions history.
+
+    History before the current week is aggregated and written first. The
+    current week is aggregated separately right before it is written, and its
+    open buckets (today, this week) are $set from that count, so only a
+    completion landing between that aggregation and its write can be missed
+    or counted twice.
+    """
+    await task_catalog.refresh()
+    now = datetime.utcnow()
+    open_buckets = {(granularity, rollup_bucket_start(now, granularity)) for granularity in ROLLUP_GRANULARITIES}
+    recent_start = min(bucket for _, bucket in open_buckets)
+    
+    written, skipped = 0, 0
+    for match in [{"completed_at": {"$not": {"$gte": recent_start}}}, {"completed_at": {"$gte": recent_start}}]:
+        buckets, match_skipped = await aggregate_rollup_buckets(match)
+        skipped += match_skipped
+        operations = []
+        for key, document in buckets.items():
+            if key in open_buckets:
+                operations.append(UpdateOne({"granularity": key[0], "bucket": key[1]}, {"$set": document}, upsert=True))
+            else:
+                operations.append(ReplaceOne({"granularity": key[0], "bucket": key[1]}, document, upsert=True))
+        for start in range(0, len(operations), PROGRESS_RECOMPUTE_BATCH_SIZE):
+            await db.completion_rollups.bulk_write(operations[start:start + PROGRESS_RECOMPUTE_BATCH_SIZE], ordered=False)
+        written += len(operations)
+    
+    return {"buckets_written": written, "completions_skipped": skipped}
+
+async def backfill_missing_rollups() -> Optional[dict]:
+    """Build the rollups at startup when there are completions but no buckets yet"""
+    if await db.completion_rollups.find_one({}, {"_id": 1}) or not await db.task_completions.find_one({}, {"_id": 1}):
+        return None
+    return await backfill_completion_rollups()
+
+async def get_completion_trend(
+    granularity: str,
+    start: datetime,
+    end: datetime,
+    competency_area: Optional[str] = None,
+    sub_competency: Optional[str] = None,
+    task_id: Optional[str] = None
+) -> List[dict]:
+    """Completions per bucket in [start, end], zero-filled, optionally narrowed to an area, sub-competency or task"""
+    if task_id:
+        path = f"tasks.{task_id}"
+    elif competency_area and sub_competency:
+        path = f"subs.{competency_area}.{sub_competency}"
+    elif competency_area:
+        path = f"areas.{competency_area}"
+    else:
+        path = "total"
+    
+    first, last = rollup_bucket_start(start, granularity), rollup_bucket_start(end, granularity)
+    docs = await db.completion_rollups.find(
+        {"granularity": granularity, "bucket": {"$gte": first, "$lte": last}},
+        {"_id": 0, "bucket": 1, path: 1}
+    ).to_list(ROLLUP_MAX_BUCKETS)
+    
+    counts = {}
+    for doc in docs:
+        value = doc
+        for key in path.split("."):
+            value = value.get(key, {}) if isinstance(value, dict) else {}
+        counts[doc["bucket"]] = value if isinstance(value, int) else 0
+    
+    series = []
+    bucket = first
+    while bucket <= last:
+        series.append({"bucket": bucket, "completions": counts.get(bucket, 0)})
+        bucket += ROLLUP_GRANULARITIES[granularity]
+    return series
+
+# Admin statistics
+# Activity and area figures come from user_summaries (one document per
+# participant, backfilled at startup) and the last 30 daily completion
+# rollups; total_completions is a plain count of task_completions. Results
+# are cached per worker for ADMIN_STATS_TTL and dropped when users or the
+# catalog change.
+ADMIN_STATS_TTL = 30  # Seconds
+ADMIN_STATS_DAYS = 30  # Days covered by completions_per_day
+
+admin_stats_cache: Dict[str, Any] = {"stats": None, "expires_at": 0.0}
+
+def invalidate_admin_stats():
+    admin_stats_cache["stats"] = None
+
+async def compute_admin_stats() -> AdminStats:
+    now = datetime.utcnow()
+    today = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    first_day = today - timedelta(days=ADMIN_STATS_DAYS - 1)
+    
+    total_users, total_completions, summary_facets, daily, active_tasks = await asyncio.gather(
+        db.users.count_documents({"is_admin": False}),
+        db.task_completions.count_documents({}),
+        db.user_summaries.aggregate([
+            {"$facet": {
+                "active_7d": [{"$match": {"last_activity": {"$gte": now - timedelta(days=7)}}}, {"$count": "n"}],
+                "active_30d": [{"$match": {"last_activity": {"$gte": now - timedelta(days=30)}}}, {"$count": "n"}],
+                "areas": [
+                    {"$project": {"areas": {"$objectToArray": "$area_progress"}}},
+                    {"$unwind": "$areas"},
+                    {"$group": {"_id": "$areas.k", "total": {"$sum": "$areas.v"}}}
+                ]
+            }}
+        ]).to_list(1),
+        get_completion_trend("day", first_day, today),
+        task_catalog.active_tasks()
+    )
+    facets = summary_facets[0]
+    total_tasks = len(active_tasks)
+    
+    # Calculate completion rate
+    completion_rate = 0.0
+    if total_tasks > 0 and total_users > 0:
+        possible_completions = total_tasks * total_users
+        completion_rate = (total_completions / possible_completions) * 100
+    
+    # Participants without a summary have made no progress and count as 0%
+    area_totals = {doc["_id"]: doc["total"] for doc in facets["areas"]}
+    area_completion_rates = {
+        area_key: round(area_totals.get(area_key, 0.0) / total_users, 2) if total_users else 0.0
+        for area_key in NAVIGATOR_COMPETENCIES
+    }
+    
+    completions_per_day = [
+        {"date": point["bucket"].strftime("%Y-%m-%d"), "completions": point["completions"]} for point in daily
+    ]
+    
+    return AdminStats(
+        total_users=total_users,
+        total_tasks=total_tasks,
+        total_completions=total_completions,
+        completion_rate=round(completion_rate, 2),
+        active_competency_areas=len(NAVIGATOR_COMPETENCIES),
+        area_completion_rates=area_completion_rates,
+        active_users_7d=facets["active_7d"][0]["n"] if facets["active_7d"] else 0,
+        active_users_30d=facets["active_30d"][0]["n"] if facets["active_30d"] else 0,
+        completions_per_day=completions_per_day,
+        generated_at=now
+    )
+
+async def get_admin_stats(refresh: bool = False) -> AdminStats:
+    if not refresh and admin_stats_cache["stats"] is not None and time.monotonic() < admin_stats_cache["expires_at"]:
+        return admin_stats_cache["stats"]
+    stats = await compute_admin_stats()
+    admin_stats_cache["stats"] = stats
+    admin_stats_cache["expires_at"] = time.monotonic() + ADMIN_STATS_TTL
+    return stats
+
+# Cohort analytics
+# The report is rebuilt when the task catalog version moves, and otherwise at
+# most once per ANALYTICS_CACHE_TTL since completions keep arriving.
+ANALYTICS_CACHE_TTL = 10 * 60  # Seconds
+ANALYTICS_TASK_SORTS = {"blocked_users", "completions", "completion_rate"}
+
+analytics_cache: Dict[str, Any] = {"version": None, "report": None, "expires_at": 0.0}
+analytics_lock = asyncio.Lock()
+
+async def get_analytics_report(refresh: bool = False) -> dict:
+    await task_catalog.refresh()
+    async with analytics_lock:
+        cached = analytics_cache["report"]
+        if (
+            not refresh
+            and cached is not None
+            and analytics_cache["version"] == task_catalog.version
+            and time.monotonic() < analytics_cache["expires_at"]
+        ):
+            return cached
+        
+        version = task_catalog.version
+        tasks = pd.DataFrame(
+            task_catalog.tasks, columns=["id", "title", "competency_area", "sub_competency", "order"]
+        )
+        frames = await load_frames(db, tasks["id"].tolist())
+        report = await asyncio.to_thread(
+            build_report, frames["users"], tasks, frames["completions"], NAVIGATOR_COMPETENCIES
+        )
+        report["catalog_version"] = version
+        analytics_cache.update(version=version, report=report, expires_at=time.monotonic() + ANALYTICS_CACHE_TTL)
+        return report
+
+def competency_progress_update(user_id: str, area_key: str, sub_key: str, percentage: float, completed: int, total: int) -> UpdateOne:
+    """Upsert for one stored competency progress record"""
+    return UpdateOne(
+        {"user_id": user_id, "competency_area": area_key, "sub_competency": sub_key},
+        {
+            "$set": {
+                "completion_percentage": percentage,
+                "completed_tasks": completed,
+                "total_tasks": total,
+                "last_updated": datetime.utcnow()
+            },
+            "$setOnInsert": {
+                "evidence_items": []
+            },
+            "$inc": {"revision": 1}
+        },
+        upsert=True
+    )
+
+async def update_all_competency_progress(user_id: str):
+    """Recalculate all competency progress for a user (one aggregation, one bulk write)"""
+    progress = await compute_all_competency_progress(user_id)
+    await db.competency_progress.bulk_write([
+        competency_progress_update(user_id, area_key, sub_key, percentage, completed, total)
+        for (area_key, sub_key), (percentage, completed, total) in progress.items()
+    ], ordered=False)
+    await refresh_user_summaries([user_id])
+
+def is_framework_slice(competency_area: str, sub_competency: str) -> bool:
+    return sub_competency in NAVIGATOR_COMPETENCIES.get(competency_area, {}).get("sub_competencies", {})
+
+def competency_increment_pipeline(delta: int) -> List[dict]:
+    """Update pipeline adding delta completed tasks and recomputing the percentage from the stored total"""
+    return [
+        {"$set": {
+            "completed_tasks": {"$add": [{"$ifNull": ["$completed_tasks", 0]}, delta]},
+            "revision": {"$add": [{"$ifNull": ["$revision", 0]}, 1]}
+        }},
+        {"$set": {
+            "completion_percentage": {"$cond": [
+                {"$gt": ["$total_tasks", 0]},
+                {"$multiply": [{"$divide": ["$completed_tasks", "$total_tasks"]}, 100]},
+                0.0
+            ]},
+            "last_updated": "$$NOW"
+        }}
+    ]
+
+async def increment_competency_progress(user_id: str, task: dict, delta: int = 1):
+    """Apply a task completion to the stored progress of the task's sub-competency.
+
+    One atomic update adds delta to completed_tasks and recomputes the
+    percentage from the stored total, so concurrent completions cannot lose
+    counts. Users without a progress record get a full recompute instead.
+    The user's summary is refreshed either way.
+    """
+    if not task.get("active", True):
+        # Completions of inactive tasks do not count towards progress
+        await refresh_user_summaries([user_id])
+        return
+    
+    area, sub = task["competency_area"], task["sub_competency"]
+    result = await db.competency_progress.update_one(
+        {"user_id": user_id, "competency_area": area, "sub_competency": sub},
+        competency_increment_pipeline(delta)
+    )
+    if result.matched_count == 0 and is_framework_slice(area, sub):
+        await update_all_competency_progress(user_id)
+    else:
+        await refresh_user_summaries([user_id])
+
+async def apply_competency_increments(increments: Dict[tuple[str, str, str], int]):
+    """Batch form of increment_competency_progress for {(user_id, area, sub_competency): delta}.
+
+    All stored slices are updated in one bulk write. Users missing a record
+    for an affected slice get one full recompute each instead, and every
+    affected user's summary is refreshed together.
+    """
+    user_ids = sorted({user_id for user_id, _, _ in increments})
+    if not user_ids:
+        return
+    stored = {
+        (doc["user_id"], doc["competency_area"], doc["sub_competency"])
+        for doc in await db.competency_progress.find(
+            {"user_id": {"$in": user_ids}},
+            {"_id": 0, "user_id": 1, "competency_area": 1, "sub_competency": 1}
+        ).to_list(None)
+    }
+    rebuild = {
+        user_id for user_id, area, sub in increments
+        if (user_id, area, sub) not in stored and is_framework_slice(area, sub)
+    }
+    
+    operations = [
+        UpdateOne(
+            {"user_id": user_id, "competency_area": area, "sub_competency": sub},
+            competency_increment_pipeline(delta)
+        )
+        for (user_id, area, sub), delta in increments.items()
+        if (user_id, area, sub) in stored and user_id not in rebuild
+    ]
+    if operations:
+        await db.competency_progress.bulk_write(operations, ordered=False)
+    for user_id in sorted(rebuild):
+        await update_all_competency_progress(user_id)
+    await refresh_user_summaries([user_id for user_id in user_ids if user_id not in rebuild])
+
+async def recompute_competency_slice(competency_area: str, sub_competency: str, on_batch=None) -> int:
+    """Recompute one sub-competency's stored progress for every user that has a record of it.
+
+    Used when the task catalog changes, since that shifts total_tasks for
+    everyone. on_batch, if given, is awaited with the running count after each
+    bulk write. Returns the number of progress records rewritten.
+    """
+    task_ids = [task["id"] for task in await task_catalog.tasks_for(competency_area, sub_competency)]
+    total = len(task_ids)
+    
+    updated = 0
+    cursor = db.competency_progress.find(
+        {"competency_area": competency_area, "sub_competency": sub_competency},
+        {"_id": 1, "user_id": 1, "revision": 1}
+    )
+    batch = await cursor.to_list(PROGRESS_RECOMPUTE_BATCH_SIZE)
+    while batch:
+        await rewrite_slice_progress(batch, task_ids)
+        await refresh_user_summaries(list({doc["user_id"] for doc in batch}))
+        updated += len(batch)
+        if on_batch:
+            await on_batch(updated)
+        batch = await cursor.to_list(PROGRESS_RECOMPUTE_BATCH_SIZE)
+    return updated
+
+async def rewrite_slice_progress(docs: List[dict], task_ids: List[str]):
+    """Set completed/total for a batch of one slice's progress records from task_completions.
+
+    Completions are counted for just these users right before the write, and
+    each write only applies if the record's revision is unchanged, so an
+    increment landing in between is not overwritten; records it touched are
+    counted again on the next pass.
+    """
+    total = len(task_ids)
+    for _ in range(PROGRESS_RECOMPUTE_RETRIES):
+        completed_by_user = {}
+        if task_ids:
+            completed_by_user = {
+                doc["_id"]: doc["completed"] for doc in await db.task_completions.aggregate([
+                    {"$match": {"task_id": {"$in": task_ids}, "user_id": {"$in": [doc["user_id"] for doc in docs]}}},
+                    {"$group": {"_id": "$user_id", "completed": {"$sum": 1}}}
+                ]).to_list(None)
+            }
+        
+        rewrite_id = str(uuid.uuid4())
+        now = datetime.utcnow()
+        operations = []
+        for doc in docs:
+            completed = completed_by_user.get(doc["user_id"], 0)
+            operations.append(UpdateOne({"_id": doc["_id"], "revision": doc.get("revision")}, {
+                "$set": {
+                    "completion_percentage": (completed / total) * 100 if total > 0 else 0.0,
+                    "completed_tasks": completed,
+                    "total_tasks": total,
+                    "last_updated": now,
+                    "rewrite_id": rewrite_id
+                },
+                "$inc": {"revision": 1}
+            }))
+        result = await db.competency_progress.bulk_write(operations, ordered=False)
+        if result.matched_count == len(docs):
+            return
+        docs = await db.competency_progress.find(
+            {"_id": {"$in": [doc["_id"] for doc in docs]}, "rewrite_id": {"$ne": rewrite_id}},
+            {"_id": 1, "user_id": 1, "revision": 1}
+        ).to_list(None)
+        if not docs:
+            return
+    logging.warning(f"Progress rewrite gave up on {len(docs)} records still changing after {PROGRESS_RECOMPUTE_RETRIES} passes")
+
+progress_recompute_wakeup = asyncio.Event()
+
+async def enqueue_progress_recompute(slices: set):
+    """Schedule stored progress for these (area, sub_competency) slices to be recomputed for all users"""
+    job_ids = [
+        (f"{competency_area}:{sub_competency}", competency_area, sub_competency)
+        for competency_area, sub_competency in slices
+        if is_framework_slice(competency_area, sub_competency)
+    ]
+    if not job_ids:
+        return
+    
+    now = datetime.utcnow()
+    await db.progress_recompute_jobs.bulk_write([
+        UpdateOne(
+            {"id": job_id},
+            {
+                "$set": {"requested_at": now, "run_after": now + PROGRESS_RECOMPUTE_DELAY},
+                "$inc": {"generation": 1, "requests": 1},
+                "$setOnInsert": {
+                    "competency_area": competency_area,
+                    "sub_competency": sub_competency,
+                    "status": "pending"
+                }
+            },
+            upsert=True
+        )
+        for job_id, competency_area, sub_competency in job_ids
+    ], ordered=False)
+    # Finished jobs go back to pending; running ones are requeued when they finish
+    await db.progress_recompute_jobs.update_many(
+        {"id": {"$in": [job_id for job_id, _, _ in job_ids]}, "status": {"$in": ["done", "failed"]}},
+        {"$set": {"status": "pending"}}
+    )
+    progress_recompute_wakeup.set()
+
+async def claim_progress_recompute_job() -> Optional[dict]:
+    now = datetime.utcnow()
+    return await db.progress_recompute_jobs.find_one_and_update(
+        {"$or": [
+            {"status": "pending", "run_after": {"$lte": now}},
+            {"status": "running", "locked_until": {"$lt": now}}
+        ]},
+        {"$set": {
+            "status": "running",
+            "started_at": now,
+            "locked_until": now + PROGRESS_RECOMPUTE_LOCK_TIMEOUT,
+            "processed": 0,
+            "error": None
+        }},
+        sort=[("run_after", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def run_progress_recompute_job(job: dict) -> int:
+    """Recompute a claimed slice, recording processed/total as batches complete"""
+    job_filter = {"id": job["id"], "started_at": job["started_at"]}
+    total = await db.competency_progress.count_documents(
+        {"competency_area": job["competency_area"], "sub_competency": job["sub_competency"]}
+    )
+    await db.progress_recompute_jobs.update_one(job_filter, {"$set": {"total": total}})
+    
+    async def report(processed: int):
+        await db.progress_recompute_jobs.update_one(job_filter, {"$set": {
+            "processed": processed,
+            "locked_until": datetime.utcnow() + PROGRESS_RECOMPUTE_LOCK_TIMEOUT
+        }})
+    
+    # The catalog change may have been made on another worker
+    await task_catalog.refresh(force=True)
+    try:
+        updated = await recompute_competency_slice(job["competency_area"], job["sub_competency"], report)
+    except Exception as e:
+        logging.error(f"Progress recompute of {job['id']} failed: {str(e)}")
+        await db.progress_recompute_jobs.update_one(job_filter, {"$set": {
+            "status": "failed", "error": str(e), "finished_at": datetime.utcnow(), "locked_until": None
+        }})
+        return 0
+    
+    finished = {"processed": updated, "finished_at": datetime.utcnow(), "locked_until": None}
+    # Requests that arrived mid-run bumped the generation: run the slice again
+    result = await db.progress_recompute_jobs.update_one(
+        {**job_filter, "generation": job["generation"]},
+        {"$set": {"status": "done", **finished}}
+    )
+    if result.matched_count == 0:
+        await db.progress_recompute_jobs.update_one(job_filter, {"$set": {"status": "pending", **finished}})
+    return updated
+
+async def progress_recompute_worker():
+    """Background loop that runs queued progress fan-out jobs"""
+    while True:
+        try:
+            while True:
+                job = await claim_progress_recompute_job()
+                if not job:
+                    break
+                updated = await run_progress_recompute_job(job)
+                logging.info(f"Progress recompute of {job['id']}: {updated} records")
+        except Exception as e:
+            logging.error(f"Progress recompute loop failed: {str(e)}")
+        
+        progress_recompute_wakeup.clear()
+        try:
+            await asyncio.wait_for(progress_recompute_wakeup.wait(), PROGRESS_RECOMPUTE_POLL_INTERVAL)
+            await asyncio.sleep(PROGRESS_RECOMPUTE_DELAY.total_seconds())  # Let the burst settle
+        except asyncio.TimeoutError:
+            pass
+
+async def verify_competency_progress(user_id: str, repair: bool = False) -> dict:
+    """Compare a user's stored progress counters with ground truth from tasks and completions"""
+    expected = await compute_all_competency_progress(user_id)
+    stored = {
+        (doc["competency_area"], doc["sub_competency"]): doc
+        for doc in await db.competency_progress.find({"user_id": user_id}).to_list(None)
+    }
+    
+    mismatches = []
+    for (area_key, sub_key), (percentage, completed, total) in expected.items():
+        doc = stored.get((area_key, sub_key))
+        if (
+            not doc
+            or doc.get("completed_tasks") != completed
+            or doc.get("total_tasks") != total
+            or abs(doc.get("completion_percentage", 0.0) - percentage) > 1e-9
+        ):
+            mismatches.append({
+                "competency_area": area_key,
+                "sub_competency": sub_key,
+                "stored": {
+                    "completed_tasks": doc.get("completed_tasks"),
+                    "total_tasks": doc.get("total_tasks"),
+                    "completion_percentage": doc.get("completion_percentage")
+                } if doc else None,
+                "expected": {
+                    "completed_tasks": completed,
+                    "total_tasks": total,
+                    "completion_percentage": percentage
+                }
+            })
+    
+    if repair and mismatches:
+        await update_all_competency_progress(user_id)
+    
+    return {
+        "user_id": user_id,
+        "checked": len(expected),
+        "mismatches": mismatches,
+        "repaired": bool(repair and mismatches)
+    }
+
+# Keyset pagination
+# List endpoints page on their sort order with the document id as tiebreaker.
+# The cursor is the sort key of the last document returned, base64-encoded,
+# so fetching a page is an index range scan however deep the client pages.
+# Without limit or cursor the old response shape (a bare array, capped at
+# LEGACY_LIST_LIMIT) is kept and X-Next-Cursor flags a truncated list.
+DEFAULT_PAGE_SIZE = 100
+MAX_PAGE_SIZE = 500
+LEGACY_LIST_LIMIT = 1000
+TASK_LIST_SORT = [("competency_area", 1), ("sub_competency", 1), ("order", 1), ("id", 1)]  # Catalog and /tasks order
+
+def encode_cursor(values: list) -> str:
+    tagged = [{"d": value.isoformat()} if isinstance(value, datetime) else value for value in values]
+    return base64.urlsafe_b64encode(orjson.dumps(tagged)).decode().rstrip("=")
+
+def decode_cursor(cursor: str, sort: List[tuple[str, int]]) -> list:
+    try:
+        values = orjson.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(values, list) or len(values) != len(sort):
+            raise ValueError("wrong length")
+        return [
+            datetime.fromisoformat(value["d"]) if isinstance(value, dict) else value
+            for value in values
+        ]
+    except Exception:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+def sort_key(doc: dict, sort: List[tuple[str, int]]) -> list:
+    return [doc.get(field) for field, _ in sort]
+
+def null_first_key(doc: dict, sort: List[tuple[str, int]]) -> list:
+    """sort_key for comparing in Python: missing and null values order first, as in Mongo"""
+    return [(value is not None, value) for value in sort_key(doc, sort)]
+
+def keyset_query(query: dict, sort: List[tuple[str, int]], cursor: Optional[str]) -> dict:
+    """Narrow query to documents after the cursor in sort order"""
+    if not cursor:
+        return query
+    values = decode_cursor(cursor, sort)
+    branches = []
+    for position, (field, direction) in enumerate(sort):
+        branch = {sort[i][0]: values[i] for i in range(position)}
+        branch[field] = {"$lt" if direction < 0 else "$gt": values[position]}
+        branches.append(branch)
+    return {"$and": [query, {"$or": branches}]} if query else {"$or": branches}
+
+def page_size(limit: Optional[int], cursor: Optional[str]) -> tuple[int, bool]:
+    """(documents per page, whether to answer with the paginated envelope)"""
+    if limit is None and cursor is None:
+        return LEGACY_LIST_LIMIT, False
+    limit = limit or DEFAULT_PAGE_SIZE
+    if not 1 <= limit <= MAX_PAGE_SIZE:
+        raise HTTPException(status_code=400, detail=f"limit must be between 1 and {MAX_PAGE_SIZE}")
+    return limit, True
+
+def page_response(docs: List[dict], sort: List[tuple[str, int]], limit: int, paginated: bool, fields: Optional[List[str]] = None, model=None) -> FastJSONResponse:
+    """Render one page; docs holds up to limit + 1 documents, the extra one only signalling more.
+
+    Without fields, documents are passed through model (if given) so older
+    documents get its defaults.
+    """
+    items = docs[:limit]
+    next_cursor = encode_cursor(sort_key(items[-1], sort)) if len(docs) > limit else None
+    if fields:
+        items = select_fields(items, fields)
+    elif model:
+        items = [model(**item).dict() for item in items]
+    if paginated:
+        return FastJSONResponse({"items": items, "next_cursor": next_cursor})
+    return FastJSONResponse(items, headers={"X-Next-Cursor": next_cursor} if next_cursor else None)
+
+def paginate_list(items: List[dict], sort: List[tuple[str, int]], limit: int, cursor: Optional[str]) -> List[dict]:
+    """Keyset paging over an in-memory list already ordered by sort (ascending fields only)"""
+    if cursor:
+        after = [(value is not None, value) for value in decode_cursor(cursor, sort)]
+        items = [item for item in items if null_first_key(item, sort) > after]
+    return items[:limit + 1]
+
+async def find_page(collection, query: dict, sort: List[tuple[str, int]], limit: Optional[int], cursor: Optional[str], projection: Optional[dict] = None, fields: Optional[List[str]] = None, model=None) -> FastJSONResponse:
+    size, paginated = page_size(limit, cursor)
+    if fields:
+        projection = field_projection(fields, [field for field, _ in sort])
+    docs = await collection.find(
+        keyset_query(query, sort, cursor), projection or {"_id": 0}
+    ).sort(sort).to_list(size + 1)
+    return page_response(docs, sort, size, paginated, fields, model)
+
+# Sparse fieldsets: ?fields=id,title,active
+# Requested fields become a Mongo projection (plus the sort key, which the
+# cursor needs, and any stored field a computed one is derived from) and
+# responses are trimmed to exactly the requested fields. id is always included.
+RESOURCE_FIELDS = {
+    "task": set(Task.model_fields),
+    "completion": set(TaskCompletion.model_fields),
+    "portfolio": set(PortfolioItem.model_fields) | {"file_size_formatted"},
+    "user": set(User.model_fields) - {"password_hash"},
+    "admin_user": (set(User.model_fields) - {"password_hash"}) | {"completed_tasks", "overall_progress", "area_progress", "last_activity"},
+}
+FIELD_SOURCES = {"file_size_formatted": ["file_size"]}  # Computed field -> stored fields it needs
+
+def requested_fields(fields: Optional[str], resource: str) -> Optional[List[str]]:
+    if not fields:
+        return None
+    names = ["id"] + [name.strip() for name in fields.split(",") if name.strip()]
+    unknown = sorted(set(names) - RESOURCE_FIELDS[resource])
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown fields: {', '.join(unknown)}. Allowed: {', '.join(sorted(RESOURCE_FIELDS[resource]))}"
+        )
+    return list(dict.fromkeys(names))
+
+def field_projection(fields: List[str], extra: List[str] = ()) -> dict:
+    projection = {"_id": 0}
+    for name in [*fields, *extra]:
+        for source in FIELD_SOURCES.get(name, [name]):
+            projection[source] = 1
+    return projection
+
+def select_fields(docs: List[dict], fields: List[str]) -> List[dict]:
+    return [{name: doc[name] for name in fields if name in doc} for doc in docs]
+
+# Pre-serialized catalog responses
+# The framework and the task catalog change only on deploy or admin edits, so
+# their JSON is rendered and compressed once per catalog version and served
+# from memory with a weak ETag; revalidation is answered with 304.
+PRECOMPRESS_MIN_SIZE = 1024  # Bytes; smaller bodies are only sent uncompressed
+FRAMEWORK_CACHE_CONTROL = "public, max-age=3600"  # Changes only on deploy
+CATALOG_CACHE_CONTROL = "no-cache"  # Cache, but revalidate on every use (cheap 304)
+
+precompressed_responses: Dict[str, dict] = {}
+
+def build_precompressed(content: Any, version: str) -> dict:
+    body = orjson.dumps(content, default=orjson_default, option=orjson.OPT_NON_STR_KEYS)
+    bodies = {"identity": body}
+    if len(body) >= PRECOMPRESS_MIN_SIZE:
+        bodies["gzip"] = gzip.compress(body, compresslevel=9, mtime=0)
+        if brotli is not None:
+            bodies["br"] = brotli.compress(body, quality=11)
+    digest = hashlib.sha256(body).hexdigest()[:16]
+    return {"version": version, "etag": f'W/"{version}-{digest}"', "bodies": bodies}
+
+def choose_encoding(accept_encoding: str, available) -> str:
+    """Best of br, gzip, identity that the client accepts (q=0 excludes)"""
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        if params.strip().startswith("q="):
+            try:
+                quality = float(params.strip()[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        if encoding in available and accepted.get(encoding, accepted.get("*", 0.0)) > 0:
+            return encoding
+    return "identity"
+
+async def precompressed_response(request: Request, key: str, version: str, load, cache_control: str) -> Response:
+    """Serve key's cached rendering for version, building it (off the event loop) when missing or outdated"""
+    entry = precompressed_responses.get(key)
+    if entry is None or entry["version"] != version:
+        content = await load()
+        entry = await asyncio.to_thread(build_precompressed, content, version)
+        precompressed_responses[key] = entry
+    
+    headers = {"ETag": entry["etag"], "Cache-Control": cache_control, "Vary": "Accept-Encoding"}
+    if etag_matches(request.headers.get("if-none-match", ""), entry["etag"]):
+        return Response(status_code=304, headers=headers)
+    
+    encoding = choose_encoding(request.headers.get("accept-encoding", ""), entry["bodies"])
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=entry["bodies"][encoding], media_type="application/json", headers=headers)
+
+# Routes
+@api_router.get("/")
+async def root():
+    return {"message": "Earn Your Wings Platform API"}
+
+# Authentication Routes
+@api_router.post("/admin/login")
+async def admin_login(login_data: AdminLogin):
+    user = await db.users.find_one({"email": login_data.email, "is_admin": True})
+    if not user:
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    if not verify_password(login_data.password, user["password_hash"]):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+    
+    access_token_expires = timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
+    access_token = create_access_token(
+        data={"sub": user["id"]}, expires_delta=access_token_expires
+    )
+    return {"access_token": access_token, "token_type": "bearer", "user": serialize_doc(user)}
+
+@api_router.post("/admin/create")
+async def create_admin(user_data: UserCreate):
+    """Create admin user - should be protected in production"""
+    if not user_data.is_admin or not user_data.password:
+        raise HTTPException(status_code=400, detail="Admin user requires password")
+    
+    # Check if admin already exists
     existing = await db.users.find_one({"email": user_data.email})
     if existing:
         raise HTTPException(status_code=400, detail="User already exists")
@@ -809,6 +2849,7 @@ async def create_user(user_data: UserCreate):
         user.password_hash = get_password_hash(user_data.password)
     
     await db.users.insert_one(user.dict())
+    invalidate_admin_stats()
     
     # Initialize competency progress for new user
     await update_all_competency_progress(user.id)
@@ -822,22 +2863,46 @@ async def get_user(user_id: str):
         raise HTTPException(status_code=404, detail="User not found")
     return User(**user_data)
 
-@api_router.get("/users", response_model=List[User])
-async def get_all_users():
-    users = await db.users.find().to_list(1000)
-    return [User(**user) for user in users]
+@api_router.get("/users")
+async def get_all_users(limit: Optional[int] = None, cursor: Optional[str] = None, fields: Optional[str] = None):
+    return await find_page(
+        db.users, {}, [("created_at", 1), ("id", 1)], limit, cursor,
+        {"_id": 0, **{field: 1 for field in User.model_fields}},
+        requested_fields(fields, "user"),
+        User
+    )
 
 @api_router.get("/competencies")
-async def get_competency_framework():
-    return NAVIGATOR_COMPETENCIES
+async def get_competency_framework(request: Request):
+    async def load():
+        return NAVIGATOR_COMPETENCIES
+    return await precompressed_response(request, "framework", "framework", load, FRAMEWORK_CACHE_CONTROL)
 
 @api_router.get("/users/{user_id}/competencies")
 async def get_user_competencies(user_id: str):
-    # Update progress before returning
-    await update_all_competency_progress(user_id)
-    
+    return await build_user_competencies(user_id)
+
+async def build_user_competencies(user_id: str) -> dict:
+    """Progress organized by competency area, as served by /users/{user_id}/competencies"""
+    # Read-only: stored progress is kept current by completions and catalog changes
     competencies = await db.competency_progress.find({"user_id": user_id}).to_list(1000)
     
+    if not competencies:
+        # No stored records yet - answer from ground truth without writing
+        competencies = [
+            {
+                "competency_area": area_key,
+                "sub_competency": sub_key,
+                "completion_percentage": percentage,
+                "completed_tasks": completed,
+                "total_tasks": total,
+                "evidence_items": [],
+                "last_updated": None
+            }
+            for (area_key, sub_key), (percentage, completed, total)
+            in (await compute_all_competency_progress(user_id)).items()
+        ]
+    
     # Organize by competency area
     organized = {}
     for comp in competencies:
@@ -883,59 +2948,82 @@ async def get_user_competencies(user_id: str):
     return organized
 
 @api_router.get("/tasks")
-async def get_all_tasks():
-    tasks = await db.tasks.find({"active": True}).sort("competency_area", 1).sort("sub_competency", 1).sort("order", 1).to_list(1000)
-    return [serialize_doc(task) for task in tasks]
+async def get_all_tasks(
+    request: Request,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    active_tasks = await task_catalog.active_tasks()
+    if limit is None and cursor is None and fields is None and len(active_tasks) <= LEGACY_LIST_LIMIT:
+        async def load():
+            return active_tasks
+        return await precompressed_response(
+            request, "tasks", f"tasks-v{task_catalog.version}", load, CATALOG_CACHE_CONTROL
+        )
+    
+    # The catalog is already ordered by this key
+    size, paginated = page_size(limit, cursor)
+    tasks = paginate_list(active_tasks, TASK_LIST_SORT, size, cursor)
+    return page_response(tasks, TASK_LIST_SORT, size, paginated, requested_fields(fields, "task"))
 
 @api_router.get("/tasks/{competency_area}/{sub_competency}")
-async def get_tasks_for_competency(competency_area: str, sub_competency: str):
-    tasks = await db.tasks.find({
-        "competency_area": competency_area,
-        "sub_competency": sub_competency,
-        "active": True
-    }).sort("order", 1).to_list(1000)
-    return [serialize_doc(task) for task in tasks]
+async def get_tasks_for_competency(request: Request, competency_area: str, sub_competency: str, fields: Optional[str] = None):
+    tasks = await task_catalog.tasks_for(competency_area, sub_competency)
+    if fields is None and is_framework_slice(competency_area, sub_competency):
+        async def load():
+            return tasks
+        return await precompressed_response(
+            request, f"tasks:{competency_area}:{sub_competency}",
+            f"tasks-v{task_catalog.version}", load, CATALOG_CACHE_CONTROL
+        )
+    selected = requested_fields(fields, "task")
+    return FastJSONResponse(select_fields(tasks, selected) if selected else tasks)
 
 @api_router.get("/users/{user_id}/tasks/{competency_area}/{sub_competency}")
-async def get_user_tasks_for_competency(user_id: str, competency_area: str, sub_competency: str):
-    # Get all tasks for this competency
-    tasks = await db.tasks.find({
-        "competency_area": competency_area,
-        "sub_competency": sub_competency,
-        "active": True
-    }).sort("order", 1).to_list(1000)
+async def get_user_tasks_for_competency(user_id: str, competency_area: str, sub_competency: str, fields: Optional[str] = None):
+    # Get all tasks for this competency; fields narrows the task part only
+    tasks = await task_catalog.tasks_for(competency_area, sub_competency)
+    selected = requested_fields(fields, "task")
     
     # Get user's completed tasks
     task_ids = [task["id"] for task in tasks]
     completions = await db.task_completions.find({
         "user_id": user_id,
         "task_id": {"$in": task_ids}
-    }).to_list(1000)
+    }, {"_id": 0}).to_list(1000)
     
-    completion_map = {comp["task_id"]: serialize_doc(comp) for comp in completions}
+    completion_map = {comp["task_id"]: comp for comp in completions}
     
-    # Add completion status to tasks
-    serialized_tasks = []
-    for task in tasks:
-        task_data = serialize_doc(task)
-        task_data["completed"] = task["id"] in completion_map
+    # Add completion status to tasks (shallow copies: the catalog's documents are shared)
+    user_tasks = []
+    for task in select_fields(tasks, selected) if selected else tasks:
+        task_data = {**task, "completed": task["id"] in completion_map}
         if task_data["completed"]:
             task_data["completion_data"] = completion_map[task["id"]]
-        serialized_tasks.append(task_data)
+        user_tasks.append(task_data)
     
-    return serialized_tasks
+    return FastJSONResponse(user_tasks)
 
 # Task Completion Routes
+def attach_evidence_file(completion: TaskCompletion, file_data: dict):
+    """Record a stored evidence file on its completion; blob locations carry no filename, so keep it here"""
+    completion.evidence_file_path = file_data["file_path"]
+    completion.evidence_content_hash = file_data["content_hash"]
+    completion.evidence_original_filename = file_data["original_filename"]
+    completion.evidence_mime_type = file_data["mime_type"]
+
 @api_router.post("/users/{user_id}/task-completions")
 async def complete_task(
     user_id: str,
     task_id: str = Form(...),
     evidence_description: str = Form(""),
     notes: str = Form(""),
-    file: UploadFile = File(None)
+    file: UploadFile = File(None),
+    upload_id: Optional[str] = Form(None)
 ):
     # Check if task exists
-    task = await db.tasks.find_one({"id": task_id})
+    task = await task_catalog.get(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -952,19 +3040,30 @@ async def complete_task(
     )
     
     # Handle file upload if provided using enhanced system
-    if file:
+    file_data = None
+    if file or upload_id:
         try:
-            file_data = await save_uploaded_file(file, "evidence", user_id, completion.id)
-            completion.evidence_file_path = file_data["file_path"]
+            if upload_id:
+                file_data = await commit_upload_session(upload_id, "evidence", user_id, completion.id)
+            else:
+                file_data = await save_uploaded_file(file, "evidence", user_id, completion.id)
+            attach_evidence_file(completion, file_data)
         except HTTPException:
             raise  # Re-raise validation errors
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Evidence file upload failed: {str(e)}")
     
-    await db.task_completions.insert_one(completion.dict())
+    try:
+        await db.task_completions.insert_one(completion.dict())
+    except DuplicateKeyError:
+        # Completed by a concurrent request since the check above
+        if file_data:
+            await discard_stored_file(file_data, user_id)
+        raise HTTPException(status_code=400, detail="Task already completed")
+    await record_completion_rollups([(task, completion.completed_at)])
     
     # Update competency progress
-    await update_all_competency_progress(user_id)
+    await increment_competency_progress(user_id, task)
     
     return completion
 
@@ -975,10 +3074,11 @@ async def complete_task_new(
     task_id: str = Form(...),
     evidence_description: str = Form(""),
     notes: str = Form(""),
-    file: UploadFile = File(None)
+    file: UploadFile = File(None),
+    upload_id: Optional[str] = Form(None)
 ):
     # Check if task exists
-    task = await db.tasks.find_one({"id": task_id})
+    task = await task_catalog.get(task_id)
     if not task:
         raise HTTPException(status_code=404, detail="Task not found")
     
@@ -995,27 +3095,218 @@ async def complete_task_new(
     )
     
     # Handle file upload if provided using enhanced system
-    if file:
+    file_data = None
+    if file or upload_id:
         try:
-            file_data = await save_uploaded_file(file, "evidence", user_id, completion.id)
-            completion.evidence_file_path = file_data["file_path"]
+            if upload_id:
+                file_data = await commit_upload_session(upload_id, "evidence", user_id, completion.id)
+            else:
+                file_data = await save_uploaded_file(file, "evidence", user_id, completion.id)
+            attach_evidence_file(completion, file_data)
         except HTTPException:
             raise  # Re-raise validation errors
         except Exception as e:
             raise HTTPException(status_code=500, detail=f"Evidence file upload failed: {str(e)}")
     
-    await db.task_completions.insert_one(completion.dict())
+    try:
+        await db.task_completions.insert_one(completion.dict())
+    except DuplicateKeyError:
+        # Completed by a concurrent request since the check above
+        if file_data:
+            await discard_stored_file(file_data, user_id)
+        raise HTTPException(status_code=400, detail="Task already completed")
+    await record_completion_rollups([(task, completion.completed_at)])
     
     # Update competency progress
-    await update_all_competency_progress(user_id)
+    await increment_competency_progress(user_id, task)
     
     return serialize_doc(completion.dict())
 
+# Batch task completions
+BATCH_COMPLETION_MAX_ITEMS = 500  # Items accepted by POST /task-completions/batch
+
+async def share_stored_file(file_data: dict, user_id: str, file_id: str) -> dict:
+    """Reference a file already stored in this request for another record, without storing it again"""
+    blob = await add_blob_reference(file_data["content_hash"], file_data["file_size"])
+    await record_storage_change(file_data["file_type"], user_id, datetime.utcnow(), file_data["file_size"], 1)
+    return {
+        **file_data,
+        "file_path": blob["path"],
+        "secure_filename": generate_secure_filename(file_data["original_filename"], file_id)
+    }
+
+async def discard_stored_file(file_data: dict, user_id: str):
+    """Undo save_uploaded_file or commit_upload_session for a file whose record was never written"""
+    await release_blob(file_data["content_hash"])
+    await record_storage_change(file_data["file_type"], user_id, datetime.utcnow(), -file_data["file_size"], -1)
+
+@api_router.post("/task-completions/batch")
+async def complete_tasks_batch(
+    items: str = Form(...),
+    files: List[UploadFile] = File(None)
+):
+    """Record many completions at once, e.g. after a workshop.
+
+    items is a JSON array of {user_id, task_id, evidence_description?, notes?,
+    file_index?, upload_id?}; file_index points into the uploaded files list.
+    Every item gets its own result, and one bad item does not fail the rest.
+    """
+    try:
+        entries = json.loads(items)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="items must be a JSON array")
+    if not isinstance(entries, list) or not entries:
+        raise HTTPException(status_code=400, detail="items must be a non-empty JSON array")
+    if len(entries) > BATCH_COMPLETION_MAX_ITEMS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_COMPLETION_MAX_ITEMS} items per batch")
+    files = files or []
+    
+    results = [{"index": index, "status": "failed"} for index in range(len(entries))]
+    pending = []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict) or not isinstance(entry.get("user_id"), str) or not isinstance(entry.get("task_id"), str):
+            results[index]["error"] = "user_id and task_id are required"
+            continue
+        results[index].update(user_id=entry["user_id"], task_id=entry["task_id"])
+        invalid = [
+            field for field in ("evidence_description", "notes", "upload_id")
+            if entry.get(field) is not None and not isinstance(entry[field], str)
+        ]
+        if invalid:
+            results[index]["error"] = f"{', '.join(invalid)} must be a string"
+            continue
+        file_index = entry.get("file_index")
+        if file_index is not None and (
+            isinstance(file_index, bool) or not isinstance(file_index, int) or not 0 <= file_index < len(files)
+        ):
+            results[index]["error"] = "file_index does not match an uploaded file"
+            continue
+        pending.append((index, entry))
+    
+    # One $in query each for users, tasks and existing completions
+    user_ids = list({entry["user_id"] for _, entry in pending})
+    task_ids = list({entry["task_id"] for _, entry in pending})
+    known_users = {
+        user["id"] for user in await db.users.find({"id": {"$in": user_ids}}, {"_id": 0, "id": 1}).to_list(None)
+    }
+    await task_catalog.refresh()
+    tasks = {task_id: task_catalog.by_id[task_id] for task_id in task_ids if task_id in task_catalog.by_id}
+    missing_tasks = [task_id for task_id in task_ids if task_id not in tasks]
+    if missing_tasks:
+        # Possibly created by another worker inside the catalog staleness window
+        for task in await db.tasks.find({"id": {"$in": missing_tasks}}, {"_id": 0}).to_list(None):
+            tasks[task["id"]] = task
+    completed = {
+        (doc["user_id"], doc["task_id"]) for doc in await db.task_completions.find(
+            {"user_id": {"$in": user_ids}, "task_id": {"$in": task_ids}},
+            {"_id": 0, "user_id": 1, "task_id": 1}
+        ).to_list(None)
+    }
+    
+    completions = []
+    stored_files: Dict[int, dict] = {}  # file_index -> file data of its first store
+    failed_files: Dict[int, str] = {}  # file_index -> why storing it failed
+    for index, entry in pending:
+        user_id, task_id = entry["user_id"], entry["task_id"]
+        if user_id not in known_users:
+            results[index]["error"] = "User not found"
+            continue
+        if task_id not in tasks:
+            results[index]["error"] = "Task not found"
+            continue
+        if (user_id, task_id) in completed:
+            results[index]["error"] = "Task already completed"
+            continue
+        completed.add((user_id, task_id))  # Also rejects repeats within the batch
+        
+        try:
+            completion = TaskCompletion(
+                user_id=user_id,
+                task_id=task_id,
+                evidence_description=entry.get("evidence_description") or "",
+                notes=entry.get("notes") or ""
+            )
+        except ValueError as e:
+            results[index]["error"] = str(e)
+            continue
+        file_data = None
+        file_index = entry.get("file_index")
+        if file_index in failed_files and not entry.get("upload_id"):
+            results[index]["error"] = failed_files[file_index]
+            continue
+        if file_index is not None or entry.get("upload_id"):
+            try:
+                if entry.get("upload_id"):
+                    file_data = await commit_upload_session(entry["upload_id"], "evidence", user_id, completion.id)
+                elif file_index in stored_files:
+                    # Several items may share one upload, e.g. a workshop sign-in sheet
+                    file_data = await share_stored_file(stored_files[file_index], user_id, completion.id)
+                else:
+                    file_data = await save_uploaded_file(files[file_index], "evidence", user_id, completion.id)
+                    stored_files[file_index] = file_data
+                attach_evidence_file(completion, file_data)
+            except HTTPException as e:
+                results[index]["error"] = e.detail
+                if file_index is not None and not entry.get("upload_id"):
+                    failed_files[file_index] = e.detail
+                continue
+            except Exception as e:
+                results[index]["error"] = f"Evidence file upload failed: {str(e)}"
+                if file_index is not None and not entry.get("upload_id"):
+                    failed_files[file_index] = results[index]["error"]
+                continue
+        completions.append((index, completion, file_data))
+    
+    inserted = [(index, completion) for index, completion, _ in completions]
+    if completions:
+        try:
+            await db.task_completions.insert_many([completion.dict() for _, completion, _ in completions], ordered=False)
+        except BulkWriteError as e:
+            failed = {
+                error["index"]: "Task already completed" if error.get("code") == 11000 else error.get("errmsg", "Insert failed")
+                for error in e.details.get("writeErrors", [])
+            }
+            for position, (index, completion, file_data) in enumerate(completions):
+                if position in failed:
+                    results[index]["error"] = failed[position]
+                    if file_data:
+                        await discard_stored_file(file_data, completion.user_id)
+            inserted = [(index, completion) for position, (index, completion, _) in enumerate(completions) if position not in failed]
+        except Exception as e:
+            for _, completion, file_data in completions:
+                if file_data:
+                    await discard_stored_file(file_data, completion.user_id)
+            raise HTTPException(status_code=500, detail=f"Failed to record completions: {str(e)}")
+    
+    # One progress update per affected user and sub-competency
+    increments: Dict[tuple[str, str, str], int] = {}
+    for index, completion in inserted:
+        task = tasks[completion.task_id]
+        results[index].update(status="created", completion_id=completion.id)
+        if task.get("active", True):
+            key = (completion.user_id, task["competency_area"], task["sub_competency"])
+            increments[key] = increments.get(key, 0) + 1
+    if inserted:
+        await record_completion_rollups([(tasks[completion.task_id], completion.completed_at) for _, completion in inserted])
+        await apply_competency_increments(increments)
+        # Users whose only new completions were of inactive tasks still need a fresh summary
+        await refresh_user_summaries(sorted(
+            {completion.user_id for _, completion in inserted} - {user_id for user_id, _, _ in increments}
+        ))
+    
+    return {
+        "created": len(inserted),
+        "failed": len(entries) - len(inserted),
+        "results": results
+    }
+
 # Admin Task Management Routes
 @api_router.post("/admin/tasks", response_model=Task)
 async def admin_create_task(task_data: TaskCreate, admin_user = Depends(get_current_admin)):
     task = Task(**task_data.dict(), created_by=admin_user["id"])
     await db.tasks.insert_one(task.dict())
+    await bump_task_catalog_version()
+    await enqueue_progress_recompute({(task.competency_area, task.sub_competency)})
     return task
 
 @api_router.put("/admin/tasks/{task_id}", response_model=Task)
@@ -1030,77 +3321,211 @@ async def admin_update_task(task_id: str, task_update: TaskUpdate, admin_user =
     update_data["updated_at"] = datetime.utcnow()
     
     await db.tasks.update_one({"id": task_id}, {"$set": update_data})
+    await bump_task_catalog_version()
     
     # Return updated task
     updated_task = await db.tasks.find_one({"id": task_id})
+    
+    # Moving or (de)activating a task changes totals in the old and new sub-competency
+    if any(existing_task.get(field) != updated_task.get(field) for field in ("competency_area", "sub_competency", "active")):
+        await enqueue_progress_recompute({
+            (existing_task["competency_area"], existing_task["sub_competency"]),
+            (updated_task["competency_area"], updated_task["sub_competency"])
+        })
     return Task(**serialize_doc(updated_task))
 
 @api_router.delete("/admin/tasks/{task_id}")
 async def admin_delete_task(task_id: str, admin_user = Depends(get_current_admin)):
-    result = await db.tasks.update_one({"id": task_id}, {"$set": {"active": False}})
-    if result.matched_count == 0:
+    task = await db.tasks.find_one_and_update({"id": task_id}, {"$set": {"active": False}})
+    if not task:
         raise HTTPException(status_code=404, detail="Task not found")
+    await bump_task_catalog_version()
+    if task.get("active", True):
+        await enqueue_progress_recompute({(task["competency_area"], task["sub_competency"])})
     return {"message": "Task deactivated successfully"}
 
 @api_router.get("/admin/tasks")
-async def admin_get_all_tasks(admin_user = Depends(get_current_admin)):
-    tasks = await db.tasks.find().sort("created_at", -1).to_list(1000)
-    return [serialize_doc(task) for task in tasks]
+async def admin_get_all_tasks(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    admin_user = Depends(get_current_admin)
+):
+    return await find_page(
+        db.tasks, {}, [("created_at", -1), ("id", -1)], limit, cursor, fields=requested_fields(fields, "task")
+    )
 
 @api_router.get("/admin/stats")
-async def admin_get_stats(admin_user = Depends(get_current_admin)):
-    # Get total counts
-    total_users = await db.users.count_documents({"is_admin": False})
-    total_tasks = await db.tasks.count_documents({"active": True})
-    total_completions = await db.task_completions.count_documents({})
+async def admin_get_stats(refresh: bool = False, admin_user = Depends(get_current_admin)):
+    """Dashboard totals, per-area rates, active users and daily completions (cached; refresh=true bypasses)"""
+    return await get_admin_stats(refresh)
+
+@api_router.get("/admin/users")
+async def admin_get_all_users(
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+    admin_user = Depends(get_current_admin)
+):
+    # Progress stats come from the user_summaries read model in the same query
+    sort = [("created_at", 1), ("id", 1)]
+    size, paginated = page_size(limit, cursor)
+    selected = requested_fields(fields, "admin_user")
+    projection = {"_id": 0, "summary._id": 0}
+    if selected:
+        projection = {**field_projection(selected, [field for field, _ in sort]), "summary": 1}
+    users = await db.users.aggregate([
+        {"$match": keyset_query({"is_admin": False}, sort, cursor)},
+        {"$sort": dict(sort)},
+        {"$limit": size + 1},
+        {"$lookup": {"from": "user_summaries", "localField": "id", "foreignField": "user_id", "as": "summary"}},
+        {"$project": projection}
+    ]).to_list(None)
     
-    # Calculate completion rate
-    completion_rate = 0.0
-    if total_tasks > 0 and total_users > 0:
-        possible_completions = total_tasks * total_users
-        completion_rate = (total_completions / possible_completions) * 100
+    for user in users:
+        summary = user.pop("summary")
+        summary = summary[0] if summary else {}
+        user["completed_tasks"] = summary.get("completed_tasks", 0)
+        user["overall_progress"] = summary.get("overall_progress", 0.0)
+        user["area_progress"] = summary.get("area_progress", {})
+        user["last_activity"] = summary.get("last_activity")
+    
+    return page_response(users, sort, size, paginated, selected)
+
+@api_router.post("/admin/users/summaries/rebuild")
+async def admin_rebuild_user_summaries(admin_user = Depends(get_current_admin)):
+    """Rewrite every participant's summary from progress and completions (backfill after deploy)"""
+    rebuilt = await rebuild_user_summaries()
+    return {"users_rebuilt": rebuilt}
+
+@api_router.post("/admin/competencies/verify")
+async def admin_verify_competency_progress(
+    user_id: Optional[str] = None,
+    repair: bool = False,
+    admin_user = Depends(get_current_admin)
+):
+    """Check stored progress counters against tasks and completions; repair=true rewrites drifted users"""
+    if user_id:
+        return await verify_competency_progress(user_id, repair)
     
-    # Active competency areas
-    active_competency_areas = len(NAVIGATOR_COMPETENCIES)
+    users_checked = 0
+    drifted = []
+    async for user in db.users.find({"is_admin": {"$ne": True}}, {"id": 1}):
+        result = await verify_competency_progress(user["id"], repair)
+        users_checked += 1
+        if result["mismatches"]:
+            drifted.append({"user_id": user["id"], "mismatches": len(result["mismatches"])})
     
-    return AdminStats(
-        total_users=total_users,
-        total_tasks=total_tasks,
-        total_completions=total_completions,
-        completion_rate=round(completion_rate, 2),
-        active_competency_areas=active_competency_areas
-    )
+    return {
+        "users_checked": users_checked,
+        "users_with_drift": len(drifted),
+        "drifted_users": drifted[:100],
+        "repaired": repair
+    }
 
-@api_router.get("/admin/users")
-async def admin_get_all_users(admin_user = Depends(get_current_admin)):
-    users = await db.users.find({"is_admin": False}).to_list(1000)
+@api_router.get("/admin/competencies/recompute-jobs")
+async def admin_get_recompute_jobs(admin_user = Depends(get_current_admin)):
+    """Progress fan-out jobs queued by task catalog changes, with per-slice progress"""
+    jobs = await db.progress_recompute_jobs.find({}, {"_id": 0}).sort("requested_at", -1).to_list(100)
+    return {
+        "pending": sum(1 for job in jobs if job["status"] == "pending"),
+        "running": sum(1 for job in jobs if job["status"] == "running"),
+        "jobs": [serialize_doc(job) for job in jobs]
+    }
+
+# Admin analytics routes
+@api_router.get("/admin/analytics/areas")
+async def admin_analytics_areas(refresh: bool = False, admin_user = Depends(get_current_admin)):
+    """Progress distribution per competency area and mean progress per sub-competency"""
+    report = await get_analytics_report(refresh)
+    return {
+        "generated_at": report["generated_at"],
+        "catalog_version": report["catalog_version"],
+        "users": report["users"],
+        "areas": report["areas"]
+    }
+
+@api_router.get("/admin/analytics/cohorts")
+async def admin_analytics_cohorts(refresh: bool = False, admin_user = Depends(get_current_admin)):
+    """Average progress per area for each join-month cohort"""
+    report = await get_analytics_report(refresh)
+    return {
+        "generated_at": report["generated_at"],
+        "catalog_version": report["catalog_version"],
+        "cohorts": report["cohorts"]
+    }
+
+@api_router.get("/admin/analytics/tasks")
+async def admin_analytics_tasks(
+    sort: str = "blocked_users",
+    limit: int = 50,
+    refresh: bool = False,
+    admin_user = Depends(get_current_admin)
+):
+    """Per-task completions and blockers; blocked_users sorts most-blocking first, the others least-completed first"""
+    if sort not in ANALYTICS_TASK_SORTS:
+        raise HTTPException(status_code=400, detail=f"sort must be one of: {', '.join(sorted(ANALYTICS_TASK_SORTS))}")
+    report = await get_analytics_report(refresh)
+    tasks = sorted(report["task_stats"], key=lambda task: task[sort], reverse=sort == "blocked_users")
+    return {
+        "generated_at": report["generated_at"],
+        "catalog_version": report["catalog_version"],
+        "users": report["users"],
+        "completions": report["completions"],
+        "tasks": tasks[:max(limit, 0)]
+    }
+
+@api_router.get("/admin/analytics/completions-trend")
+async def admin_completions_trend(
+    granularity: str = "day",
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    competency_area: Optional[str] = None,
+    sub_competency: Optional[str] = None,
+    task_id: Optional[str] = None,
+    admin_user = Depends(get_current_admin)
+):
+    """Completions per day or week from the rollups (default: last 30 days or 26 weeks)"""
+    if granularity not in ROLLUP_GRANULARITIES:
+        raise HTTPException(status_code=400, detail="granularity must be 'day' or 'week'")
+    if sub_competency and not competency_area:
+        raise HTTPException(status_code=400, detail="sub_competency requires competency_area")
     
-    # Add progress stats for each user
-    users_with_stats = []
-    for user in users:
-        user_data = serialize_doc(user)
-        
-        # Get completion count for this user
-        completions = await db.task_completions.count_documents({"user_id": user["id"]})
-        user_data["completed_tasks"] = completions
-        
-        # Get overall progress
-        progress_docs = await db.competency_progress.find({"user_id": user["id"]}).to_list(1000)
-        if progress_docs:
-            total_progress = sum(doc["completion_percentage"] for doc in progress_docs)
-            user_data["overall_progress"] = round(total_progress / len(progress_docs), 1)
-        else:
-            user_data["overall_progress"] = 0.0
-            
-        users_with_stats.append(user_data)
+    step = ROLLUP_GRANULARITIES[granularity]
+    # Buckets are naive UTC
+    start, end = [
+        moment.astimezone(timezone.utc).replace(tzinfo=None) if moment and moment.tzinfo else moment
+        for moment in (start, end)
+    ]
+    end = end or datetime.utcnow()
+    start = start or end - step * (30 if granularity == "day" else 26)
+    if start > end:
+        raise HTTPException(status_code=400, detail="start must not be after end")
+    if (end - start) / step >= ROLLUP_MAX_BUCKETS:
+        raise HTTPException(status_code=400, detail=f"Range covers more than {ROLLUP_MAX_BUCKETS} buckets; use a coarser granularity")
     
-    return users_with_stats
+    return {
+        "granularity": granularity,
+        "series": await get_completion_trend(granularity, start, end, competency_area, sub_competency, task_id)
+    }
+
+@api_router.post("/admin/analytics/rollups/backfill")
+async def admin_backfill_rollups(admin_user = Depends(get_current_admin)):
+    """Rebuild daily and weekly completion rollups from task_completions history"""
+    return await backfill_completion_rollups()
 
 # Task Completion Routes
 @api_router.get("/users/{user_id}/task-completions")
-async def get_user_task_completions(user_id: str):
-    completions = await db.task_completions.find({"user_id": user_id}).sort("completed_at", -1).to_list(1000)
-    return [serialize_doc(completion) for completion in completions]
+async def get_user_task_completions(
+    user_id: str,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    return await find_page(
+        db.task_completions, {"user_id": user_id}, [("completed_at", -1), ("id", -1)], limit, cursor,
+        fields=requested_fields(fields, "completion")
+    )
 
 # Admin route to seed sample tasks
 @api_router.post("/admin/seed-tasks")
@@ -1113,6 +3538,14 @@ async def seed_sample_tasks():
     for task_data in SAMPLE_TASKS:
         task = Task(**task_data, created_by="system")
         await db.tasks.insert_one(task.dict())
+    await bump_task_catalog_version()
+    
+    # Every sub-competency's task set was replaced
+    await enqueue_progress_recompute({
+        (area_key, sub_key)
+        for area_key, area_data in NAVIGATOR_COMPETENCIES.items()
+        for sub_key in area_data["sub_competencies"]
+    })
     
     return {"message": f"Seeded {len(SAMPLE_TASKS)} sample tasks"}
 
@@ -1125,7 +3558,8 @@ async def create_portfolio_item(
     competency_areas: str = Form("[]"),
     tags: str = Form("[]"),
     visibility: str = Form("private"),
-    file: UploadFile = File(None)
+    file: UploadFile = File(None),
+    upload_id: Optional[str] = Form(None)
 ):
     try:
         competency_areas_list = json.loads(competency_areas) if competency_areas else []
@@ -1147,11 +3581,15 @@ async def create_portfolio_item(
     )
     
     # Handle file upload if provided using our enhanced system
-    if file:
+    if file or upload_id:
         try:
-            file_data = await save_uploaded_file(file, "portfolio", user_id, portfolio_item.id)
+            if upload_id:
+                file_data = await commit_upload_session(upload_id, "portfolio", user_id, portfolio_item.id)
+            else:
+                file_data = await save_uploaded_file(file, "portfolio", user_id, portfolio_item.id)
             
             portfolio_item.file_path = file_data["file_path"]
+            portfolio_item.content_hash = file_data["content_hash"]
             portfolio_item.original_filename = file_data["original_filename"]
             portfolio_item.secure_filename = file_data["secure_filename"]
             portfolio_item.file_size = file_data["file_size"]
@@ -1164,6 +3602,9 @@ async def create_portfolio_item(
     
     await db.portfolio_items.insert_one(portfolio_item.dict())
     
+    if portfolio_item.file_path and portfolio_item.mime_type in IMAGE_MIME_TYPES:
+        schedule_derivatives(portfolio_item.file_path)
+    
     # Update competency evidence for related areas
     for area in competency_areas_list:
         if area in NAVIGATOR_COMPETENCIES:
@@ -1175,42 +3616,133 @@ async def create_portfolio_item(
     return serialize_doc(portfolio_item.dict())
 
 @api_router.get("/users/{user_id}/portfolio")
-async def get_user_portfolio(user_id: str, visibility: Optional[str] = None):
-    """Get user's portfolio items with optional visibility filter"""
+async def get_user_portfolio(
+    user_id: str,
+    visibility: Optional[str] = None,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Get user's portfolio items with optional visibility filter, newest first"""
     query = {"user_id": user_id, "status": "active"}
     
     if visibility:
         query["visibility"] = visibility
     
-    items = await db.portfolio_items.find(query).sort("upload_date", -1).to_list(1000)
-    
+    sort = [("upload_date", -1), ("id", -1)]
+    size, paginated = page_size(limit, cursor)
+    selected = requested_fields(fields, "portfolio")
+    projection = field_projection(selected, [field for field, _ in sort]) if selected else {"_id": 0}
+    items = await db.portfolio_items.find(
+        keyset_query(query, sort, cursor), projection
+    ).sort(sort).to_list(size + 1)
+    add_portfolio_display_fields(items)
+    return page_response(items, sort, size, paginated, selected)
+
+def add_portfolio_display_fields(items: List[dict]):
     # Add file size formatting for display
     for item in items:
         if item.get("file_size"):
             item["file_size_formatted"] = format_file_size(item["file_size"])
+
+# Dashboard bootstrap: everything the participant views load first, in one round trip
+DASHBOARD_SECTIONS = ["user", "framework", "competencies", "tasks", "portfolio", "completions"]
+
+async def dashboard_user(user_id: str) -> dict:
+    user = await db.users.find_one({"id": user_id}, {"_id": 0, "password_hash": 0})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    return user
+
+async def dashboard_framework(user_id: str) -> dict:
+    return NAVIGATOR_COMPETENCIES
+
+async def dashboard_tasks(user_id: str) -> List[dict]:
+    return await task_catalog.active_tasks()
+
+async def dashboard_portfolio(user_id: str) -> List[dict]:
+    items = await db.portfolio_items.find(
+        {"user_id": user_id, "status": "active"}, {"_id": 0}
+    ).sort([("upload_date", -1), ("id", -1)]).to_list(LEGACY_LIST_LIMIT)
+    add_portfolio_display_fields(items)
+    return items
+
+async def dashboard_completions(user_id: str) -> List[dict]:
+    return await db.task_completions.find(
+        {"user_id": user_id}, {"_id": 0}
+    ).sort([("completed_at", -1), ("id", -1)]).to_list(LEGACY_LIST_LIMIT)
+
+DASHBOARD_LOADERS = {
+    "user": dashboard_user,
+    "framework": dashboard_framework,
+    "competencies": build_user_competencies,
+    "tasks": dashboard_tasks,
+    "portfolio": dashboard_portfolio,
+    "completions": dashboard_completions,
+}
+
+async def load_dashboard_section(name: str, user_id: str) -> tuple[Any, Optional[str]]:
+    """Run one section loader, returning (data, error) so a failing section does not fail the rest"""
+    try:
+        return await DASHBOARD_LOADERS[name](user_id), None
+    except HTTPException as e:
+        return None, e.detail
+    except Exception as e:
+        logging.error(f"Dashboard section {name} failed for {user_id}: {str(e)}")
+        return None, f"Failed to load {name}"
+
+@api_router.get("/users/{user_id}/dashboard")
+async def get_user_dashboard(user_id: str, include: Optional[str] = None):
+    """Combined first-load payload; include= picks sections (default: all), fetched concurrently.
+
+    A section that fails to load is left out and its error reported under
+    "errors", so the client can fall back for that section alone.
+    """
+    if include:
+        sections = list(dict.fromkeys(name.strip() for name in include.split(",") if name.strip()))
+        unknown = [name for name in sections if name not in DASHBOARD_LOADERS]
+        if unknown:
+            raise HTTPException(
+                status_code=400,
+                detail=f"Unknown sections: {', '.join(unknown)}. Allowed: {', '.join(DASHBOARD_SECTIONS)}"
+            )
+    else:
+        sections = DASHBOARD_SECTIONS
     
-    return [serialize_doc(item) for item in items]
+    # The user lookup always runs so an unknown user is a 404, not empty sections
+    lookups = [name for name in sections if name != "user"]
+    user, *results = await asyncio.gather(
+        dashboard_user(user_id),
+        *(load_dashboard_section(name, user_id) for name in lookups)
+    )
+    payload = {"user": user} if "user" in sections else {}
+    errors = {}
+    for name, (data, error) in zip(lookups, results):
+        if error is None:
+            payload[name] = data
+        else:
+            errors[name] = error
+    if errors:
+        payload["errors"] = errors
+    return FastJSONResponse(payload)
 
 @api_router.delete("/users/{user_id}/portfolio/{item_id}")
 async def delete_portfolio_item(user_id: str, item_id: str):
-    """Delete portfolio item and associated file"""
-    # Get the item first to access file path
-    item = await db.portfolio_items.find_one({"id": item_id, "user_id": user_id})
+    """Delete portfolio item; its file is removed later by the storage sweeper"""
+    # Soft delete - mark as deleted instead of removing completely. Matching on
+    # status makes a repeated delete a 404 rather than a second file release.
+    item = await db.portfolio_items.find_one_and_update(
+        {"id": item_id, "user_id": user_id, "status": {"$ne": "deleted"}},
+        {"$set": {"status": "deleted", "updated_at": datetime.utcnow()}}
+    )
     if not item:
         raise HTTPException(status_code=404, detail="Portfolio item not found")
     
-    # Delete the file if it exists
     if item.get("file_path"):
-        delete_file(item["file_path"])
-    
-    # Soft delete - mark as deleted instead of removing completely
-    result = await db.portfolio_items.update_one(
-        {"id": item_id, "user_id": user_id},
-        {"$set": {"status": "deleted", "updated_at": datetime.utcnow()}}
-    )
-    
-    if result.modified_count == 0:
-        raise HTTPException(status_code=404, detail="Portfolio item not found")
+        await enqueue_file_deletion(item["file_path"], item.get("content_hash"), item.get("file_size"))
+        await record_storage_change(
+            "portfolio", user_id, item.get("upload_date") or datetime.utcnow(), -(item.get("file_size") or 0), -1
+        )
     
     # Remove from competency evidence
     for area in item.get("competency_areas", []):
@@ -1234,12 +3766,283 @@ def format_file_size(size_bytes: int) -> str:
     
     return f"{size_bytes:.1f} {size_names[i]}"
 
+# Portfolio export
+ZIP_DEFLATE_EXTENSIONS = {'.txt', '.rtf', '.doc', '.xls', '.ppt', '.bmp'}  # Others are already compressed
+
+class ZipStreamBuffer:
+    """Write-only sink for zipfile that hands its output to the response as it is produced.
+
+    It has no seek/tell, so zipfile writes in streaming mode (data descriptors
+    after each entry) and never needs the finished archive in memory or on disk.
+    """
+    def __init__(self):
+        self._chunks: List[bytes] = []
+    
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+    
+    def flush(self):
+        pass
+    
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+def evidence_extension(completion: dict) -> str:
+    """Extension for an evidence file: from its original name, else its MIME type.
+
+    Only legacy per-item files have one in their location; blob locations do not.
+    """
+    original_filename = completion.get("evidence_original_filename")
+    if original_filename and Path(original_filename).suffix:
+        return Path(original_filename).suffix
+    mime_type = completion.get("evidence_mime_type")
+    extension = mimetypes.guess_extension(mime_type) if mime_type else None
+    return extension or Path(completion["evidence_file_path"]).suffix or ".bin"
+
+def zip_entry(name: str, modified: Optional[datetime], size: int) -> zipfile.ZipInfo:
+    info = zipfile.ZipInfo(name, date_time=(modified or datetime.utcnow()).timetuple()[:6])
+    info.file_size = size
+    if Path(name).suffix.lower() in ZIP_DEFLATE_EXTENSIONS:
+        info.compress_type = zipfile.ZIP_DEFLATED
+    return info
+
+async def iter_portfolio_export(user: dict):
+    """Yield a ZIP of the user's active portfolio files and task evidence, then manifest.json.
+
+    Files are copied in DOWNLOAD_CHUNK_SIZE pieces and each piece is yielded as
+    soon as zipfile has written it, so memory stays at roughly one chunk plus
+    the manifest regardless of portfolio size.
+    """
+    user_id = user["id"]
+    buffer = ZipStreamBuffer()
+    archive = zipfile.ZipFile(buffer, mode="w", allowZip64=True)
+    manifest = {
+        "user": {"id": user_id, "name": user.get("name"), "email": user.get("email")},
+        "exported_at": datetime.utcnow().isoformat(),
+        "portfolio_items": [],
+        "task_evidence": []
+    }
+    
+    async def stored_size(location: str) -> Optional[int]:
+        try:
+            size, _ = await get_storage_backend(location).stat(location)
+            return size
+        except OSError:
+            return None
+    
+    async def stream_file(name: str, location: str, modified: Optional[datetime], size: int):
+        info = zip_entry(name, modified, size)
+        deflated = info.compress_type == zipfile.ZIP_DEFLATED
+        with archive.open(info, mode="w") as entry:
+            async for chunk in get_storage_backend(location).iter_range(location, 0, size - 1):
+                if deflated:
+                    await run_file_io("zip", entry.write, chunk)  # Compress off the event loop
+                else:
+                    entry.write(chunk)
+                data = buffer.drain()
+                if data:
+                    yield data
+        yield buffer.drain()
+    
+    items = db.portfolio_items.find({"user_id": user_id, "status": "active"}).sort("upload_date", 1)
+    async for item in items:
+        entry = {
+            "id": item["id"],
+            "title": item.get("title"),
+            "description": item.get("description"),
+            "competency_areas": item.get("competency_areas", []),
+            "tags": item.get("tags", []),
+            "visibility": item.get("visibility"),
+            "upload_date": item.get("upload_date"),
+            "original_filename": item.get("original_filename"),
+            "file": None
+        }
+        if item.get("file_path"):
+            size = await stored_size(item["file_path"])
+            if size is None:
+                entry["file_missing"] = True
+            else:
+                entry["file"] = f"portfolio/{item.get('secure_filename') or item['id']}"
+                async for data in stream_file(entry["file"], item["file_path"], item.get("upload_date"), size):
+                    yield data
+        manifest["portfolio_items"].append(entry)
+    
+    task_titles = await task_catalog.titles()
+    completions = db.task_completions.find({"user_id": user_id}).sort("completed_at", 1)
+    async for completion in completions:
+        entry = {
+            "id": completion["id"],
+            "task_id": completion["task_id"],
+            "task_title": task_titles.get(completion["task_id"]),
+            "completed_at": completion.get("completed_at"),
+            "evidence_description": completion.get("evidence_description"),
+            "notes": completion.get("notes"),
+            "original_filename": completion.get("evidence_original_filename"),
+            "file": None
+        }
+        location = completion.get("evidence_file_path")
+        if location:
+            size = await stored_size(location)
+            if size is None:
+                entry["file_missing"] = True
+            else:
+                title = task_titles.get(completion["task_id"]) or "evidence"
+                entry["file"] = f"evidence/{generate_secure_filename(title + evidence_extension(completion), completion['id'])}"
+                async for data in stream_file(entry["file"], location, completion.get("completed_at"), size):
+                    yield data
+        manifest["task_evidence"].append(entry)
+    
+    archive.writestr("manifest.json", json.dumps(manifest, indent=2, default=str))
+    archive.close()
+    yield buffer.drain()
+
+@api_router.get("/users/{user_id}/portfolio/export")
+async def export_user_portfolio(user_id: str):
+    """Download the user's whole portfolio and task evidence as a streamed ZIP"""
+    user = await db.users.find_one({"id": user_id})
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    
+    filename = f"portfolio_{user_id}_{datetime.utcnow().strftime('%Y%m%d')}.zip"
+    return StreamingResponse(
+        iter_portfolio_export(user),
+        media_type="application/zip",
+        headers={"Content-Disposition": content_disposition(filename), "Cache-Control": "no-store"}
+    )
+
+# HTTP range and conditional request helpers
+def parse_range_header(range_header: str, file_size: int) -> Optional[List[tuple[int, int]]]:
+    """Parse a "bytes=" Range header into inclusive (start, end) pairs.
+
+    Returns None when the header should be ignored (malformed, another unit or
+    too many ranges) and an empty list when no range is satisfiable.
+    """
+    unit, _, range_set = range_header.partition("=")
+    if unit.strip().lower() != "bytes" or not range_set:
+        return None
+    
+    specs = [spec.strip() for spec in range_set.split(",") if spec.strip()]
+    if not specs or len(specs) > MAX_RANGES_PER_REQUEST:
+        return None
+    
+    ranges = []
+    for spec in specs:
+        start_text, dash, end_text = spec.partition("-")
+        if not dash:
+            return None
+        try:
+            if not start_text:
+                # Suffix range: the last N bytes
+                suffix_length = int(end_text)
+                if suffix_length <= 0:
+                    continue
+                start, end = max(file_size - suffix_length, 0), file_size - 1
+            else:
+                start = int(start_text)
+                end = int(end_text) if end_text else file_size - 1
+        except ValueError:
+            return None
+        if start < 0 or (end_text and end < start):
+            return None
+        if start >= file_size:
+            continue
+        ranges.append((start, min(end, file_size - 1)))
+    
+    return ranges
+
+def etag_matches(header_value: str, etag: str, weak: bool = True) -> bool:
+    """Check an If-None-Match / If-Range style list of entity tags against etag"""
+    def opaque(tag: str) -> str:
+        return tag[2:] if tag.startswith("W/") else tag
+    
+    for candidate in (tag.strip() for tag in header_value.split(",")):
+        if candidate == "*":
+            return True
+        if weak and opaque(candidate) == opaque(etag):
+            return True
+        if not weak and candidate == etag and not etag.startswith("W/"):
+            return True
+    return False
+
+def is_not_modified(request: Request, etag: str, last_modified: float) -> bool:
+    """Evaluate If-None-Match (preferred) and If-Modified-Since for a GET"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        return etag_matches(if_none_match, etag)
+    
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        return int(last_modified) <= since.timestamp()
+    return False
+
+def range_is_current(request: Request, etag: str, last_modified_header: str) -> bool:
+    """If-Range: only honour Range when the client's validator still matches"""
+    if_range = request.headers.get("if-range")
+    if not if_range:
+        return True
+    if_range = if_range.strip()
+    if if_range.startswith('"') or if_range.startswith("W/"):
+        return etag_matches(if_range, etag, weak=False)
+    return if_range == last_modified_header
+
+async def iter_file_range(file_path: str, start: int, end: int):
+    """Yield bytes start..end (inclusive) of a file, reading on the file I/O executor"""
+    f = await run_file_io("open", open, file_path, "rb")
+    try:
+        await run_file_io("seek", f.seek, start)
+        remaining = end - start + 1
+        while remaining > 0:
+            chunk = await run_file_io("read", f.read, min(DOWNLOAD_CHUNK_SIZE, remaining))
+            if not chunk:
+                break
+            remaining -= len(chunk)
+            yield chunk
+    finally:
+        await run_file_io("close", f.close)
+
+async def iter_multipart_ranges(backend, location: str, ranges: List[tuple[int, int]], parts: List[bytes], boundary: str):
+    for (start, end), part_header in zip(ranges, parts):
+        yield part_header
+        async for chunk in backend.iter_range(location, start, end):
+            yield chunk
+    yield f"\r\n--{boundary}--\r\n".encode()
+
+def content_disposition(filename: str) -> str:
+    ascii_name = filename.encode("ascii", "ignore").decode().replace('"', "")
+    if ascii_name == filename:
+        return f'attachment; filename="{filename}"'
+    return f"attachment; filename=\"{ascii_name or 'download'}\"; filename*=utf-8''{quote(filename)}"
+
 # File serving endpoint for secure access
 @api_router.get("/files/{file_type}/{file_id}")
-async def serve_file(file_type: str, file_id: str, user_id: Optional[str] = None):
-    """Serve uploaded files with basic access control"""
+async def serve_file(
+    request: Request,
+    file_type: str,
+    file_id: str,
+    user_id: Optional[str] = None,
+    variant: Optional[str] = None
+):
+    """Serve uploaded files with basic access control.
+
+    Supports byte ranges (single and multipart), a strong ETag derived from the
+    stored content hash, Last-Modified, and 304 revalidation. Image portfolio
+    items can be fetched as a resized ``variant`` (see DERIVATIVE_VARIANTS),
+    rendered on first request if the upload-time render has not produced it.
+    """
     if file_type not in ["portfolio", "evidence"]:
         raise HTTPException(status_code=404, detail="File not found")
+    if variant is not None and variant not in DERIVATIVE_VARIANTS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown variant. Available variants: {', '.join(DERIVATIVE_VARIANTS)}"
+        )
     
     # For portfolio files, check if the item exists and user has access
     if file_type == "portfolio":
@@ -1250,7 +4053,9 @@ async def serve_file(file_type: str, file_id: str, user_id: Optional[str] = None
         # For now, allow access to the file owner
         # TODO: Add proper access control based on visibility settings
         file_path = item.get("file_path")
+        content_hash = item.get("content_hash")
         original_filename = item.get("original_filename", "download")
+        mime_type = item.get("mime_type")
         
     elif file_type == "evidence":
         completion = await db.task_completions.find_one({"id": file_id})
@@ -1258,47 +4063,316 @@ async def serve_file(file_type: str, file_id: str, user_id: Optional[str] = None
             raise HTTPException(status_code=404, detail="File not found")
         
         file_path = completion.get("evidence_file_path")
-        original_filename = f"evidence_{file_id}"
+        content_hash = completion.get("evidence_content_hash")
+        original_filename = completion.get("evidence_original_filename") or f"evidence_{file_id}"
+        mime_type = completion.get("evidence_mime_type")
+    
+    if not file_path:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    media_type = 'application/octet-stream'
+    cache_control = "private, no-cache"
+    if variant:
+        if file_type != "portfolio" or mime_type not in IMAGE_MIME_TYPES:
+            raise HTTPException(status_code=404, detail="No preview available for this file")
+        spec = DERIVATIVE_VARIANTS[variant]
+        backend = get_storage_backend(file_path)
+        variant_path = get_derivative_location(file_path, variant)
+        if not await backend.exists(variant_path):
+            if not await backend.exists(file_path):
+                raise HTTPException(status_code=404, detail="File not found")
+            try:
+                variant_path = (await ensure_derivatives(file_path))[variant]
+            except Exception as e:
+                logging.error(f"Derivative rendering failed for {file_path}: {str(e)}")
+                raise HTTPException(status_code=404, detail="No preview available for this file")
+        file_path = variant_path
+        content_hash = f"{content_hash}-{variant}" if content_hash else None
+        original_filename = f"{Path(original_filename).stem}_{variant}.{spec['extension']}"
+        media_type = spec["media_type"]
+        # A derivative never changes for a given item, so caches may keep it
+        cache_control = "private, max-age=31536000, immutable"
+    
+    backend = get_storage_backend(file_path)
+    if backend.supports_presigned_urls:
+        # Object storage serves the bytes (with its own range and ETag handling)
+        url = await backend.presigned_get_url(file_path, original_filename, media_type)
+        return RedirectResponse(url, status_code=307, headers={"Cache-Control": "private, no-store"})
     
-    if not file_path or not Path(file_path).exists():
+    try:
+        file_size, file_mtime = await backend.stat(file_path)
+    except OSError:
         raise HTTPException(status_code=404, detail="File not found")
     
-    return FileResponse(
-        path=file_path,
-        filename=original_filename,
-        media_type='application/octet-stream'
+    # Blobs are content-addressed, so their hash is a strong validator;
+    # legacy per-item files fall back to a weak size/mtime tag
+    etag = f'"{content_hash}"' if content_hash else f'W/"{file_size:x}-{int(file_mtime):x}"'
+    last_modified = formatdate(file_mtime, usegmt=True)
+    headers = {
+        "ETag": etag,
+        "Last-Modified": last_modified,
+        "Accept-Ranges": "bytes",
+        "Cache-Control": cache_control,
+        "Content-Disposition": content_disposition(original_filename)
+    }
+    
+    if is_not_modified(request, etag, file_mtime):
+        return Response(status_code=304, headers=headers)
+    
+    range_header = request.headers.get("range")
+    ranges = None
+    if range_header and range_is_current(request, etag, last_modified):
+        ranges = parse_range_header(range_header, file_size)
+    
+    if ranges is None:
+        headers["Content-Length"] = str(file_size)
+        return StreamingResponse(
+            backend.iter_range(file_path, 0, file_size - 1), media_type=media_type, headers=headers
+        )
+    
+    if not ranges:
+        headers["Content-Range"] = f"bytes */{file_size}"
+        return Response(status_code=416, headers=headers)
+    
+    if len(ranges) == 1:
+        start, end = ranges[0]
+        headers["Content-Range"] = f"bytes {start}-{end}/{file_size}"
+        headers["Content-Length"] = str(end - start + 1)
+        return StreamingResponse(
+            backend.iter_range(file_path, start, end), status_code=206, media_type=media_type, headers=headers
+        )
+    
+    boundary = uuid.uuid4().hex
+    parts = [
+        (
+            f"\r\n--{boundary}\r\n"
+            f"Content-Type: {media_type}\r\n"
+            f"Content-Range: bytes {start}-{end}/{file_size}\r\n\r\n"
+        ).encode()
+        for start, end in ranges
+    ]
+    closing = f"\r\n--{boundary}--\r\n".encode()
+    headers["Content-Length"] = str(
+        sum(len(part) for part in parts) + sum(end - start + 1 for start, end in ranges) + len(closing)
+    )
+    return StreamingResponse(
+        iter_multipart_ranges(backend, file_path, ranges, parts, boundary),
+        status_code=206,
+        media_type=f"multipart/byteranges; boundary={boundary}",
+        headers=headers
+    )
+
+@api_router.get("/files/{file_type}/{file_id}/url")
+async def get_file_url(request: Request, file_type: str, file_id: str, variant: Optional[str] = None):
+    """URL a client can fetch the file from: presigned for object storage, the API route otherwise"""
+    response = await serve_file(request, file_type, file_id, variant=variant)
+    if isinstance(response, RedirectResponse):
+        return {"url": response.headers["location"], "expires_in": PRESIGNED_URL_EXPIRY}
+    url = f"/api/files/{file_type}/{file_id}" + (f"?variant={variant}" if variant else "")
+    return {"url": url, "expires_in": None}
+
+# Resumable upload endpoints (tus-style: create, PATCH at offset, HEAD for offset)
+def upload_session_headers(session: dict) -> dict:
+    return {
+        "Upload-Offset": str(session["offset"]),
+        "Upload-Length": str(session["total_size"]),
+        "Upload-Expires": session["expires_at"].strftime("%a, %d %b %Y %H:%M:%S GMT"),
+        "Cache-Control": "no-store"
+    }
+
+async def get_active_upload_session(upload_id: str) -> dict:
+    session = await db.upload_sessions.find_one({"id": upload_id, "status": "uploading"})
+    if not session or session["expires_at"] < datetime.utcnow():
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return session
+
+@api_router.post("/uploads", status_code=201)
+async def create_upload_session(session_data: UploadSessionCreate, response: Response):
+    """Start a resumable upload; the file is committed later via upload_id on the portfolio or completion endpoints"""
+    is_valid, message = validate_file_metadata(session_data.filename, session_data.content_type)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=message)
+    if session_data.total_size <= 0:
+        raise HTTPException(status_code=400, detail="Upload length must be positive")
+    if session_data.total_size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+    
+    session = UploadSession(**session_data.dict())
+    await run_file_io("create", get_upload_session_path(session.id).touch)
+    await db.upload_sessions.insert_one(session.dict())
+    
+    response.headers.update(upload_session_headers(session.dict()))
+    response.headers["Location"] = f"/api/uploads/{session.id}"
+    return serialize_doc(session.dict())
+
+@api_router.post("/uploads/direct", status_code=201)
+async def create_direct_upload(upload_data: DirectUploadCreate):
+    """Start an upload that the client PUTs straight to object storage.
+
+    The object key is the content hash, so content that is already stored
+    needs no upload at all (upload_required is false). Commit the session by
+    passing upload_id to the portfolio or task completion endpoints.
+    """
+    if not storage_backend.supports_presigned_urls:
+        raise HTTPException(status_code=400, detail="Direct uploads require an object storage backend")
+    is_valid, message = validate_file_metadata(upload_data.filename, upload_data.content_type)
+    if not is_valid:
+        raise HTTPException(status_code=400, detail=message)
+    if upload_data.total_size <= 0 or upload_data.total_size > MAX_FILE_SIZE:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Upload length must be between 1 byte and {MAX_FILE_SIZE // (1024*1024)}MB"
+        )
+    content_hash = upload_data.sha256.lower()
+    if not SHA256_PATTERN.match(content_hash):
+        raise HTTPException(status_code=400, detail="sha256 must be a hex SHA-256 digest")
+    
+    existing = await db.file_blobs.find_one({"sha256": content_hash})
+    location = existing["path"] if existing else storage_backend.location_for(get_blob_key(content_hash))
+    backend = get_storage_backend(location)
+    upload_required = not await backend.exists(location)
+    if upload_required and not backend.supports_presigned_urls:
+        raise HTTPException(status_code=409, detail="This file must be sent as a regular upload")
+    
+    session = UploadSession(
+        **upload_data.dict(exclude={"sha256"}),
+        mode="direct",
+        content_hash=content_hash,
+        blob_location=location
     )
+    await db.upload_sessions.insert_one(session.dict())
+    
+    result = {
+        "upload_id": session.id,
+        "upload_required": upload_required,
+        "expires_at": session.expires_at
+    }
+    if upload_required:
+        url, headers = await backend.presigned_put_url(
+            location, upload_data.content_type, upload_data.total_size, content_hash
+        )
+        result.update({"upload_url": url, "upload_method": "PUT", "upload_headers": headers})
+    return serialize_doc(result)
+
+@api_router.head("/uploads/{upload_id}")
+async def get_upload_offset(upload_id: str):
+    session = await get_active_upload_session(upload_id)
+    return Response(status_code=200, headers=upload_session_headers(session))
+
+@api_router.get("/uploads/{upload_id}")
+async def get_upload_session(upload_id: str, response: Response):
+    session = await get_active_upload_session(upload_id)
+    response.headers.update(upload_session_headers(session))
+    return serialize_doc(session)
+
+@api_router.patch("/uploads/{upload_id}")
+async def append_upload_chunk(
+    upload_id: str,
+    request: Request,
+    upload_offset: int = Header(..., alias="Upload-Offset")
+):
+    """Append the request body to the session at Upload-Offset.
+
+    Bytes received before a dropped connection are kept, so the client can HEAD
+    the session and resume from the stored offset.
+    """
+    now = datetime.utcnow()
+    session = await db.upload_sessions.find_one_and_update(
+        {
+            "id": upload_id,
+            "status": "uploading",
+            "mode": {"$ne": "direct"},
+            "expires_at": {"$gte": now},
+            "$or": [{"locked_until": None}, {"locked_until": {"$lt": now}}]
+        },
+        {"$set": {"locked_until": now + UPLOAD_SESSION_LOCK_TIMEOUT}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not session:
+        await get_active_upload_session(upload_id)  # 404 if missing or expired
+        raise HTTPException(status_code=409, detail="Another chunk is being written to this upload")
+    
+    written = session["offset"]
+    try:
+        if upload_offset != session["offset"]:
+            raise HTTPException(
+                status_code=409,
+                detail=f"Upload-Offset mismatch: expected {session['offset']}"
+            )
+        
+        buffer = await run_file_io("open", open, get_upload_session_path(upload_id), "r+b")
+        try:
+            # Drop any bytes past the recorded offset left by an interrupted request
+            await run_file_io("truncate", buffer.truncate, written)
+            await run_file_io("seek", buffer.seek, written)
+            async for chunk in request.stream():
+                if written + len(chunk) > session["total_size"]:
+                    raise HTTPException(status_code=400, detail="Chunk exceeds declared upload length")
+                await run_file_io("write", buffer.write, chunk)
+                written += len(chunk)
+        finally:
+            await run_file_io("close", buffer.close)
+    except ClientDisconnect:
+        pass  # Keep what arrived; the client resumes from the stored offset
+    finally:
+        session = await db.upload_sessions.find_one_and_update(
+            {"id": upload_id},
+            {"$set": {
+                "offset": written,
+                "locked_until": None,
+                "expires_at": datetime.utcnow() + UPLOAD_SESSION_TTL
+            }},
+            return_document=ReturnDocument.AFTER
+        )
+    
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    return Response(status_code=204, headers=upload_session_headers(session))
+
+@api_router.delete("/uploads/{upload_id}")
+async def cancel_upload_session(upload_id: str):
+    result = await db.upload_sessions.delete_one({"id": upload_id, "status": "uploading"})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Upload session not found")
+    await delete_file(str(get_upload_session_path(upload_id)))
+    return Response(status_code=204)
 
 # Storage management endpoints
 @api_router.get("/admin/storage/stats")
-async def get_storage_stats(admin_user = Depends(get_current_admin)):
-    """Get storage usage statistics"""
-    def get_directory_size(directory: Path) -> tuple[int, int]:
-        """Get total size and file count of directory"""
-        total_size = 0
-        file_count = 0
-        
-        if directory.exists():
-            for file_path in directory.rglob("*"):
-                if file_path.is_file():
-                    total_size += file_path.stat().st_size
-                    file_count += 1
-        
-        return total_size, file_count
+async def get_storage_stats(user_id: Optional[str] = None, admin_user = Depends(get_current_admin)):
+    """Get storage usage statistics from the storage ledger.
+
+    Counters are maintained as files are stored and deleted, so this reads a
+    handful of small documents instead of walking the upload directories.
+    Temp usage is as of the last reconcile.
+    """
+    ledger_docs = await db.storage_ledger.find(
+        {"scope": {"$in": ["type", "disk", "month"]}}, {"_id": 0}
+    ).to_list(1000)
+    ledger = {doc["key"]: doc for doc in ledger_docs}
     
-    # Get stats for each directory
-    portfolio_size, portfolio_files = get_directory_size(PORTFOLIO_DIR)
-    evidence_size, evidence_files = get_directory_size(EVIDENCE_DIR)
-    temp_size, temp_files = get_directory_size(TEMP_DIR)
+    def counter(key: str) -> tuple[int, int]:
+        doc = ledger.get(key, {})
+        return doc.get("bytes", 0), doc.get("files", 0)
     
-    total_size = portfolio_size + evidence_size + temp_size
-    total_files = portfolio_files + evidence_files + temp_files
+    portfolio_size, portfolio_files = counter("type:portfolio")
+    evidence_size, evidence_files = counter("type:evidence")
+    blob_size, blob_files = counter("disk:blobs")
+    legacy_size, legacy_files = counter("disk:legacy")
+    temp_size, temp_files = counter("disk:temp")
     
-    # Get database stats
-    portfolio_items_count = await db.portfolio_items.count_documents({"status": "active"})
-    evidence_items_count = await db.task_completions.count_documents({"evidence_file_path": {"$ne": None}})
+    total_size = blob_size + legacy_size + temp_size
+    total_files = blob_files + legacy_files + temp_files
     
-    return {
+    # Deduplication: logical bytes are what every reference would cost as its own copy
+    logical_bytes = portfolio_size + evidence_size
+    physical_bytes = blob_size + legacy_size
+    dedup_ratio = round(logical_bytes / physical_bytes, 2) if physical_bytes > 0 else 1.0
+    
+    stats = {
         "total_storage_bytes": total_size,
         "total_storage_formatted": format_file_size(total_size),
         "total_files": total_files,
@@ -1306,27 +4380,81 @@ async def get_storage_stats(admin_user = Depends(get_current_admin)):
             "portfolio": {
                 "size_bytes": portfolio_size,
                 "size_formatted": format_file_size(portfolio_size),
-                "file_count": portfolio_files,
-                "db_records": portfolio_items_count
+                "file_count": portfolio_files
             },
             "evidence": {
                 "size_bytes": evidence_size,
                 "size_formatted": format_file_size(evidence_size),
-                "file_count": evidence_files,
-                "db_records": evidence_items_count
+                "file_count": evidence_files
             },
             "temp": {
                 "size_bytes": temp_size,
                 "size_formatted": format_file_size(temp_size),
-                "file_count": temp_files
+                "file_count": temp_files,
+                "reconciled_at": ledger.get("disk:temp", {}).get("reconciled_at")
+            },
+            "blobs": {
+                "size_bytes": blob_size,
+                "size_formatted": format_file_size(blob_size),
+                "file_count": blob_files
+            },
+            "legacy": {
+                "size_bytes": legacy_size,
+                "size_formatted": format_file_size(legacy_size),
+                "file_count": legacy_files
             }
         },
+        "by_month": {
+            doc["value"]: {"size_bytes": doc["bytes"], "file_count": doc["files"]}
+            for doc in sorted(ledger_docs, key=lambda d: d["value"]) if doc["scope"] == "month"
+        },
+        "deduplication": {
+            "logical_bytes": logical_bytes,
+            "physical_bytes": physical_bytes,
+            "saved_bytes": logical_bytes - physical_bytes,
+            "saved_formatted": format_file_size(max(logical_bytes - physical_bytes, 0)),
+            "dedup_ratio": dedup_ratio
+        },
         "constraints": {
             "max_file_size": format_file_size(MAX_FILE_SIZE),
             "allowed_extensions": list(ALLOWED_EXTENSIONS),
             "total_allowed_mime_types": len(ALLOWED_MIME_TYPES)
         }
     }
+    
+    if user_id:
+        user_doc = await db.storage_ledger.find_one({"key": f"user:{user_id}"}) or {}
+        stats["user"] = {
+            "user_id": user_id,
+            "size_bytes": user_doc.get("bytes", 0),
+            "size_formatted": format_file_size(user_doc.get("bytes", 0)),
+            "file_count": user_doc.get("files", 0)
+        }
+    
+    return serialize_doc(stats)
+
+@api_router.post("/admin/storage/reconcile")
+async def reconcile_storage_stats(admin_user = Depends(get_current_admin)):
+    """Rebuild the storage ledger from disk when counter drift is suspected"""
+    return await reconcile_storage_ledger()
+
+@api_router.get("/admin/storage/gc")
+async def get_storage_gc_status(admin_user = Depends(get_current_admin)):
+    """Deferred deletion backlog and the latest orphan scan report"""
+    queued = await db.file_deletion_queue.count_documents({"attempts": {"$lt": GC_MAX_ATTEMPTS}})
+    failed = await db.file_deletion_queue.count_documents({"attempts": {"$gte": GC_MAX_ATTEMPTS}})
+    report = await db.gc_reports.find_one({"id": "orphan_scan"}, {"_id": 0})
+    return serialize_doc({"queued_deletions": queued, "failed_deletions": failed, "last_orphan_scan": report})
+
+@api_router.post("/admin/storage/gc/orphan-scan")
+async def run_orphan_scan(admin_user = Depends(get_current_admin)):
+    """Run the orphan scan now instead of waiting for the daily sweep"""
+    return serialize_doc(await scan_for_orphans())
+
+@api_router.get("/admin/storage/io-metrics")
+async def get_file_io_metrics(admin_user = Depends(get_current_admin)):
+    """File I/O executor queue depth and per-operation latency"""
+    return file_io_metrics.snapshot()
 
 # Include the router in the main app
 app.include_router(api_router)
@@ -1337,6 +4465,7 @@ app.add_middleware(
     allow_origins=["*"],
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 # Configure logging
@@ -1346,6 +4475,40 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Long-running maintenance loops started with the app
+background_tasks: List[asyncio.Task] = []
+
+async def backfill_read_models():
+    """Fill read models written incrementally since they were introduced, for data that predates them"""
+    try:
+        summaries = await backfill_user_summaries()
+        if summaries:
+            logger.info(f"Backfilled {summaries} user summaries")
+        rollups = await backfill_missing_rollups()
+        if rollups:
+            logger.info(f"Backfilled {rollups['buckets_written']} completion rollup buckets")
+    except Exception as e:
+        logger.error(f"Read model backfill failed: {str(e)}")
+
+@app.on_event("startup")
+async def start_background_tasks():
+    try:
+        removed = await dedupe_task_completions()
+        if removed:
+            logger.warning(f"Removed {removed} duplicate task completions")
+    except Exception as e:
+        logger.error(f"Duplicate completion cleanup failed: {str(e)}")
+    report = await ensure_indexes(db)
+    logger.info(f"Indexes ensured: {len(report['indexes'])} in place, {len(report['conflicts'])} conflicts")
+    background_tasks.append(asyncio.create_task(backfill_read_models()))
+    background_tasks.append(asyncio.create_task(storage_sweeper()))
+    background_tasks.append(asyncio.create_task(progress_recompute_worker()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
+    for task in background_tasks:
+        task.cancel()
+    file_io_executor.shutdown(wait=False)
+    if derivative_executor is not None:
+        derivative_executor.shutdown(wait=False, cancel_futures=True)
     client.close()
\ No newline at end of file
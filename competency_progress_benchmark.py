@@ -0,0 +1,145 @@
+"""Benchmark update_all_competency_progress: legacy per-sub-competency loop vs single aggregation.
+
+Counts the MongoDB commands (round trips) each implementation sends, checks that
+both write identical progress records, and reports time per call.
+
+Needs a local mongod. The benchmark database is dropped and reseeded:
+
+    MONGO_URL=mongodb://localhost:27017 python competency_progress_benchmark.py
+"""
+import asyncio
+import os
+import random
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+from pymongo import monitoring
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("BENCHMARK_DB_NAME", "eyw_progress_benchmark")
+
+class CommandCounter(monitoring.CommandListener):
+    def __init__(self):
+        self.commands = Counter()
+
+    def started(self, event):
+        self.commands[event.command_name] += 1
+
+    def succeeded(self, event):
+        pass
+
+    def failed(self, event):
+        pass
+
+    def reset(self):
+        self.commands.clear()
+
+    @property
+    def total(self):
+        return sum(self.commands.values())
+
+counter = CommandCounter()
+monitoring.register(counter)  # Must happen before server.py creates its client
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+import server  # noqa: E402
+
+db = server.db
+USERS = int(os.environ.get("BENCHMARK_USERS", "50"))
+
+async def legacy_calculate_competency_progress(user_id, competency_area, sub_competency):
+    """calculate_competency_progress as it was before the aggregation engine"""
+    tasks = await db.tasks.find({
+        "competency_area": competency_area,
+        "sub_competency": sub_competency,
+        "active": True
+    }).to_list(1000)
+
+    if not tasks:
+        return 0.0, 0, 0
+
+    total_tasks = len(tasks)
+    task_ids = [task["id"] for task in tasks]
+    completed = await db.task_completions.find({
+        "user_id": user_id,
+        "task_id": {"$in": task_ids}
+    }).to_list(1000)
+
+    completed_tasks = len(completed)
+    completion_percentage = (completed_tasks / total_tasks) * 100 if total_tasks > 0 else 0.0
+    return completion_percentage, completed_tasks, total_tasks
+
+async def legacy_update_all_competency_progress(user_id):
+    """update_all_competency_progress as it was before the aggregation engine"""
+    for area_key, area_data in server.NAVIGATOR_COMPETENCIES.items():
+        for sub_key in area_data["sub_competencies"].keys():
+            percentage, completed, total = await legacy_calculate_competency_progress(user_id, area_key, sub_key)
+            await db.competency_progress.update_one(
+                {"user_id": user_id, "competency_area": area_key, "sub_competency": sub_key},
+                {
+                    "$set": {
+                        "completion_percentage": percentage,
+                        "completed_tasks": completed,
+                        "total_tasks": total,
+                        "last_updated": server.datetime.utcnow()
+                    },
+                    "$setOnInsert": {"evidence_items": []}
+                },
+                upsert=True
+            )
+
+async def seed():
+    for name in ["tasks", "task_completions", "competency_progress"]:
+        await db[name].drop()
+    await db.task_completions.create_index([("user_id", 1), ("task_id", 1)])
+    await db.competency_progress.create_index([("user_id", 1), ("competency_area", 1), ("sub_competency", 1)])
+
+    tasks = [server.Task(**task_data, created_by="benchmark").dict() for task_data in server.SAMPLE_TASKS]
+    tasks[0]["active"] = False  # Inactive tasks must not count
+    await db.tasks.insert_many(tasks)
+
+    rng = random.Random(42)
+    user_ids = [f"benchmark-user-{i}" for i in range(USERS)]
+    completions = [
+        server.TaskCompletion(user_id=user_id, task_id=task["id"]).dict()
+        for user_id in user_ids
+        for task in tasks
+        if rng.random() < 0.4
+    ]
+    await db.task_completions.insert_many(completions)
+    return user_ids
+
+async def snapshot(user_ids):
+    docs = await db.competency_progress.find(
+        {"user_id": {"$in": user_ids}},
+        {"_id": 0, "last_updated": 0}
+    ).to_list(None)
+    return sorted(docs, key=lambda d: (d["user_id"], d["competency_area"], d["sub_competency"]))
+
+async def run(label, implementation, user_ids):
+    await db.competency_progress.delete_many({})
+    counter.reset()
+    started = time.perf_counter()
+    for user_id in user_ids:
+        await implementation(user_id)
+    elapsed = time.perf_counter() - started
+    per_call = counter.total / len(user_ids)
+    print(f"{label:<12} {per_call:8.1f} round trips/call {elapsed / len(user_ids) * 1000:8.2f} ms/call  {dict(counter.commands)}")
+    return per_call, await snapshot(user_ids)
+
+async def main():
+    print(f"🔍 Seeding {USERS} users into {os.environ['DB_NAME']}...")
+    user_ids = await seed()
+
+    legacy_trips, legacy_docs = await run("legacy", legacy_update_all_competency_progress, user_ids)
+    new_trips, new_docs = await run("aggregation", server.update_all_competency_progress, user_ids)
+
+    if legacy_docs != new_docs:
+        print("❌ Progress records differ between implementations")
+        sys.exit(1)
+    print(f"✅ Identical progress records; round trips cut from {legacy_trips:.0f} to {new_trips:.0f} per call")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -4023,9 +4023,29 @@ const App = () => {
 
   const loadUserData = async (userId, refinedCompetencies = null) => {
     try {
-      // Load competencies progress from backend
-      const compResponse = await axios.get(`${API}/users/${userId}/competencies`);
-      const backendProgress = compResponse.data;
+      // Load competencies progress and portfolio from backend in one request
+      const dashboardResponse = await axios.get(`${API}/users/${userId}/dashboard`, {
+        params: { include: 'competencies,portfolio' }
+      });
+      const sectionErrors = dashboardResponse.data.errors || {};
+      
+      // Load portfolio with separate error handling
+      if (sectionErrors.portfolio) {
+        console.error('Error loading portfolio:', sectionErrors.portfolio);
+        // Initialize with empty portfolio if loading fails
+        setPortfolio([]);
+      } else {
+        const portfolioItems = dashboardResponse.data.portfolio || [];
+        setPortfolio(portfolioItems);
+        console.log(`Successfully loaded ${portfolioItems.length} portfolio items`);
+      }
+      
+      if (sectionErrors.competencies) {
+        console.error('Error loading competencies:', sectionErrors.competencies);
+        // Keep using local refined competency structure if backend fails
+        return;
+      }
+      const backendProgress = dashboardResponse.data.competencies;
       
       // Use provided refined competencies or current state
       const baseCompetencies = refinedCompetencies || competencies;
@@ -4057,22 +4077,11 @@ const App = () => {
       });
       
       setCompetencies(mergedCompetencies);
-      
-      // Load portfolio with separate error handling
-      try {
-        console.log(`Loading portfolio for user: ${userId}`);
-        const portfolioResponse = await axios.get(`${API}/users/${userId}/portfolio`);
-        console.log('Portfolio response:', portfolioResponse.data);
-        setPortfolio(portfolioResponse.data);
-        console.log(`Successfully loaded ${portfolioResponse.data.length} portfolio items`);
-      } catch (portfolioError) {
-        console.error('Error loading portfolio:', portfolioError);
-        // Initialize with empty portfolio if loading fails
-        setPortfolio([]);
-      }
     } catch (error) {
       console.error('Error loading user data:', error);
       // Keep using local refined competency structure if backend fails
+      // and initialize with empty portfolio
+      setPortfolio([]);
     }
   };
 
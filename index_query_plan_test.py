@@ -0,0 +1,175 @@
+"""Query-plan regression test: every hot query in server.py must use an index.
+
+Creates the registered indexes (backend/indexes.py) in a scratch database,
+seeds a few documents per collection, runs explain() on each query shape and
+fails if any winning plan contains a COLLSCAN.
+
+Needs a local mongod. The scratch database is dropped afterwards:
+
+    MONGO_URL=mongodb://localhost:27017 python index_query_plan_test.py
+"""
+import asyncio
+import os
+import sys
+import uuid
+from datetime import datetime, timedelta
+from pathlib import Path
+
+from motor.motor_asyncio import AsyncIOMotorClient
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+from indexes import ensure_indexes  # noqa: E402
+
+MONGO_URL = os.environ.get("MONGO_URL", "mongodb://localhost:27017")
+DB_NAME = os.environ.get("PLAN_TEST_DB_NAME", "eyw_index_plan_test")
+
+NOW = datetime.utcnow()
+USER_ID = "plan-user"
+TASK_ID = "plan-task"
+
+# (name, collection, filter, sort) for find-style queries
+FIND_QUERIES = [
+    ("user by id", "users", {"id": USER_ID}, None),
+    ("user by email", "users", {"email": "plan@example.com"}, None),
+    ("admin login", "users", {"email": "plan@example.com", "is_admin": True}, None),
+    ("users page", "users", {"$or": [{"created_at": {"$gt": NOW}}, {"created_at": NOW, "id": {"$gt": USER_ID}}]}, [("created_at", 1), ("id", 1)]),
+    ("admin users page", "users", {"is_admin": False}, [("created_at", 1), ("id", 1)]),
+    ("participants", "users", {"is_admin": {"$ne": True}}, None),
+    ("users by id list", "users", {"id": {"$in": [USER_ID, "other"]}}, None),
+    ("task by id", "tasks", {"id": TASK_ID}, None),
+    ("admin tasks page", "tasks", {}, [("created_at", -1), ("id", -1)]),
+    ("completion duplicate check", "task_completions", {"user_id": USER_ID, "task_id": TASK_ID}, None),
+    ("completion by id", "task_completions", {"id": "completion"}, None),
+    ("completions page", "task_completions", {"user_id": USER_ID}, [("completed_at", -1), ("id", -1)]),
+    ("user tasks completions", "task_completions", {"user_id": USER_ID, "task_id": {"$in": [TASK_ID, "other"]}}, None),
+    ("batch duplicate check", "task_completions", {"user_id": {"$in": [USER_ID]}, "task_id": {"$in": [TASK_ID]}}, None),
+    ("evidence orphan check", "task_completions", {"evidence_file_path": {"$in": ["/a", "/b"]}}, None),
+    ("progress by user", "competency_progress", {"user_id": USER_ID}, None),
+    ("progress record", "competency_progress", {"user_id": USER_ID, "competency_area": "a", "sub_competency": "b"}, None),
+    ("progress slice", "competency_progress", {"competency_area": "a", "sub_competency": "b"}, None),
+    ("portfolio page", "portfolio_items", {"user_id": USER_ID, "status": "active"}, [("upload_date", -1), ("id", -1)]),
+    ("portfolio by visibility", "portfolio_items", {"user_id": USER_ID, "status": "active", "visibility": "public"}, [("upload_date", -1), ("id", -1)]),
+    ("portfolio file", "portfolio_items", {"id": "item", "status": "active"}, None),
+    ("portfolio orphan check", "portfolio_items", {"file_path": {"$in": ["/a"]}, "status": {"$ne": "deleted"}}, None),
+    ("user summary", "user_summaries", {"user_id": USER_ID}, None),
+    ("recently active", "user_summaries", {"last_activity": {"$gte": NOW - timedelta(days=7)}}, None),
+    ("rollup range", "completion_rollups", {"granularity": "day", "bucket": {"$gte": NOW - timedelta(days=30), "$lte": NOW}}, None),
+    ("blob by hash", "file_blobs", {"sha256": "0" * 64}, None),
+    ("live blobs", "file_blobs", {"ref_count": {"$gt": 0}}, None),
+    ("ledger key", "storage_ledger", {"key": f"user:{USER_ID}"}, None),
+    ("ledger scopes", "storage_ledger", {"scope": {"$in": ["type", "disk", "month"]}}, None),
+    ("deletion queue claim", "file_deletion_queue", {
+        "attempts": {"$lt": 5},
+        "not_before": {"$not": {"$gt": NOW}},
+        "$or": [{"claimed_by": None}, {"claimed_at": {"$lt": NOW}}]
+    }, [("enqueued_at", 1)]),
+    ("stuck deletions", "file_deletion_queue", {"attempts": {"$gte": 5}}, None),
+    ("claimed deletions", "file_deletion_queue", {"claimed_by": "claim"}, None),
+    ("upload session", "upload_sessions", {"id": "upload", "status": "uploading"}, None),
+    ("expired uploads", "upload_sessions", {"status": "uploading", "expires_at": {"$lt": NOW}}, None),
+    ("stale commits", "upload_sessions", {"status": "committing", "committing_since": {"$lt": NOW}}, None),
+    ("direct uploads in flight", "upload_sessions", {"content_hash": {"$in": ["0" * 64]}, "status": {"$in": ["uploading", "committing"]}}, None),
+    ("recompute job", "progress_recompute_jobs", {"id": "a:b"}, None),
+    ("recompute claim", "progress_recompute_jobs", {"$or": [
+        {"status": "pending", "run_after": {"$lte": NOW}},
+        {"status": "running", "locked_until": {"$lt": NOW}}
+    ]}, [("run_after", 1)]),
+    ("recompute jobs list", "progress_recompute_jobs", {}, [("requested_at", -1)]),
+    ("gc report", "gc_reports", {"id": "orphan_scan"}, None),
+    ("catalog version", "catalog_versions", {"id": "tasks"}, None),
+]
+
+# (name, collection, pipeline) for aggregations; only the initial $match is planned
+AGGREGATIONS = [
+    ("user progress aggregation", "task_completions", [
+        {"$match": {"user_id": USER_ID}},
+        {"$group": {"_id": "$task_id", "n": {"$sum": 1}}}
+    ]),
+    ("slice completions aggregation", "task_completions", [
+        {"$match": {"task_id": {"$in": [TASK_ID, "other"]}}},
+        {"$group": {"_id": "$user_id", "completed": {"$sum": 1}}}
+    ]),
+    ("summary progress aggregation", "competency_progress", [
+        {"$match": {"user_id": {"$in": [USER_ID]}}},
+        {"$group": {"_id": "$user_id", "total": {"$sum": "$completion_percentage"}}}
+    ]),
+    ("summary completions aggregation", "task_completions", [
+        {"$match": {"user_id": {"$in": [USER_ID]}}},
+        {"$group": {"_id": "$user_id", "count": {"$sum": 1}}}
+    ]),
+]
+
+def plan_stages(plan):
+    """Every stage name in an explain plan tree"""
+    if isinstance(plan, dict):
+        if "stage" in plan:
+            yield plan["stage"]
+        for value in plan.values():
+            yield from plan_stages(value)
+    elif isinstance(plan, list):
+        for item in plan:
+            yield from plan_stages(item)
+
+def winning_plans(explain):
+    """winningPlan sections of find or aggregate explain output (sharded or not)"""
+    if isinstance(explain, dict):
+        for key, value in explain.items():
+            if key == "winningPlan":
+                yield value
+            else:
+                yield from winning_plans(value)
+    elif isinstance(explain, list):
+        for item in explain:
+            yield from winning_plans(item)
+
+async def seed(db):
+    await client_drop(db)
+    await ensure_indexes(db)
+    for i in range(20):
+        user_id = USER_ID if i == 0 else str(uuid.uuid4())
+        task_id = TASK_ID if i == 0 else str(uuid.uuid4())
+        await db.users.insert_one({"id": user_id, "email": f"user{i}@example.com", "is_admin": False, "created_at": NOW})
+        await db.tasks.insert_one({"id": task_id, "active": True, "competency_area": "a", "sub_competency": "b", "created_at": NOW})
+        await db.task_completions.insert_one({"id": str(uuid.uuid4()), "user_id": user_id, "task_id": task_id, "completed_at": NOW})
+        await db.competency_progress.insert_one({"user_id": user_id, "competency_area": "a", "sub_competency": "b", "completion_percentage": 50.0})
+        await db.portfolio_items.insert_one({"id": str(uuid.uuid4()), "user_id": user_id, "status": "active", "upload_date": NOW})
+        await db.user_summaries.insert_one({"user_id": user_id, "last_activity": NOW})
+
+async def client_drop(db):
+    await db.client.drop_database(db.name)
+
+async def main():
+    client = AsyncIOMotorClient(MONGO_URL)
+    db = client[DB_NAME]
+    print(f"🔍 Creating indexes and seeding {DB_NAME}...")
+    await seed(db)
+
+    failures = []
+    try:
+        for name, collection, query, sort in FIND_QUERIES:
+            cursor = db[collection].find(query)
+            if sort:
+                cursor = cursor.sort(sort)
+            explain = await cursor.explain()
+            stages = {stage for plan in winning_plans(explain) for stage in plan_stages(plan)}
+            if "COLLSCAN" in stages:
+                failures.append(name)
+            print(f"{'❌' if 'COLLSCAN' in stages else '✅'} {name:<32} {', '.join(sorted(stages))}")
+
+        for name, collection, pipeline in AGGREGATIONS:
+            explain = await db.command("aggregate", collection, pipeline=pipeline, explain=True)
+            stages = {stage for plan in winning_plans(explain) for stage in plan_stages(plan)}
+            if "COLLSCAN" in stages:
+                failures.append(name)
+            print(f"{'❌' if 'COLLSCAN' in stages else '✅'} {name:<32} {', '.join(sorted(stages))}")
+    finally:
+        await client_drop(db)
+        client.close()
+
+    if failures:
+        print(f"\n❌ {len(failures)} queries scan a whole collection: {', '.join(failures)}")
+        sys.exit(1)
+    print(f"\n✅ All {len(FIND_QUERIES) + len(AGGREGATIONS)} query shapes use an index")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,82 @@
+"""Microbenchmark: legacy list serialization vs the single-pass orjson path.
+
+legacy:  serialize_doc over every document (with _id), then FastAPI's
+         jsonable_encoder and JSONResponse rendering, as list endpoints did.
+orjson:  documents fetched without _id, rendered once by FastJSONResponse.
+
+No database is needed; documents are built in memory:
+
+    python serialization_benchmark.py
+"""
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+from bson import ObjectId
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ.setdefault("DB_NAME", "eyw_serialization_benchmark")
+
+sys.path.insert(0, str(Path(__file__).parent / "backend"))
+import server  # noqa: E402
+
+ITERATIONS = int(os.environ.get("BENCHMARK_ITERATIONS", "200"))
+
+def task_documents():
+    """/api/tasks and /api/admin/tasks: the sample catalog, repeated to a realistic size"""
+    docs = []
+    for copy in range(4):
+        for task_data in server.SAMPLE_TASKS:
+            docs.append(server.Task(**task_data, created_by="benchmark").dict())
+    return docs
+
+def portfolio_documents():
+    """/api/users/{id}/portfolio: a participant with a full portfolio"""
+    return [
+        server.PortfolioItem(
+            user_id="benchmark-user",
+            title=f"Evidence item {i}",
+            description="Quarterly review notes and supporting documents " * 4,
+            competency_areas=["leadership_supervision", "financial_management"],
+            tags=["review", "q3", "team"],
+            file_path=f"/app/backend/uploads/blobs/ab/cd/{i:064x}",
+            original_filename=f"evidence-{i}.pdf",
+            secure_filename=f"{i}_evidence.pdf",
+            file_size=1024 * (i + 1),
+            mime_type="application/pdf",
+        ).dict()
+        for i in range(200)
+    ]
+
+def legacy_render(docs):
+    return JSONResponse(jsonable_encoder([server.serialize_doc(doc) for doc in docs])).body
+
+def orjson_render(docs):
+    return server.FastJSONResponse(docs).body
+
+def measure(render, docs):
+    render(docs)  # Warm up
+    started = time.perf_counter()
+    for _ in range(ITERATIONS):
+        render(docs)
+    return (time.perf_counter() - started) / ITERATIONS * 1000
+
+def main():
+    for label, docs in [("tasks", task_documents()), ("portfolio", portfolio_documents())]:
+        legacy_docs = [{"_id": ObjectId(), **doc} for doc in docs]  # What the old queries returned
+        
+        expected = [{k: v for k, v in doc.items() if k != "_id"} for doc in json.loads(legacy_render(legacy_docs))]
+        if json.loads(orjson_render(docs)) != expected:
+            print(f"❌ {label}: orjson output differs from the legacy path")
+            sys.exit(1)
+        
+        legacy = measure(legacy_render, legacy_docs)
+        fast = measure(orjson_render, docs)
+        print(f"{label:<10} {len(docs):4d} docs  legacy {legacy:7.3f} ms  orjson {fast:7.3f} ms  {legacy / fast:5.1f}x")
+
+if __name__ == "__main__":
+    main()